@@ -0,0 +1,97 @@
+"""Count strategy for admin list views of large tables.
+
+sqladmin counts rows for every list page. An exact ``COUNT(*)`` of a large
+table is a full scan, so unfiltered lists use the planner's row estimate from
+``pg_class.reltuples``, and searches are counted exactly only while they stay
+below a threshold.
+"""
+
+import json
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+from sqlalchemy.sql.selectable import Subquery
+from starlette.requests import Request
+
+from src.configuration import conf
+
+TABLE_ESTIMATE = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"
+)
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a select, its parameters stay bound."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class EstimatedCountMixin:
+    """ModelView mixin which estimates counts above a threshold."""
+
+    exact_count_threshold: int = conf.admin.exact_count_threshold
+
+    async def count(self, request: Request, stmt: Select | None = None) -> int:
+        """Count rows of the list page.
+
+        :param stmt: Count of a searched list, the whole table when None
+        """
+        if stmt is None:
+            estimate = await self._table_estimate()
+            if estimate >= self.exact_count_threshold:
+                return estimate
+            return await super().count(request)
+
+        inner = self._counted_select(stmt)
+        if inner is None:
+            return await super().count(request, stmt)
+
+        bounded = await self._scalar(
+            select(func.count()).select_from(
+                inner.limit(self.exact_count_threshold).subquery()
+            )
+        )
+        if bounded < self.exact_count_threshold:
+            return bounded
+        return max(bounded, await self._plan_estimate(inner))
+
+    @staticmethod
+    def _counted_select(stmt: Select) -> Select | None:
+        """Get the select counted by sqladmin's ``count(*) FROM (select)``."""
+        froms = stmt.get_final_froms()
+        if len(froms) == 1 and isinstance(froms[0], Subquery):
+            return froms[0].element
+        return None
+
+    async def _scalar(self, stmt) -> int:
+        rows = await self._fetch(stmt)
+        return int(rows[0][0]) if rows else 0
+
+    async def _fetch(self, stmt) -> list:
+        """Rows of a statement run in a session of the view."""
+        async with self.session_maker() as session:
+            return (await session.execute(stmt)).all()
+
+    async def _table_estimate(self) -> int:
+        """Row estimate of the table, -1 when it was never analyzed."""
+        return await self._scalar(
+            TABLE_ESTIMATE.bindparams(table=self.model.__tablename__)
+        )
+
+    async def _plan_estimate(self, stmt: Select) -> int:
+        """Rows the planner expects the select to return."""
+        rows = await self._fetch(Explain(stmt))
+        plan = rows[0][0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
@@ -5,11 +5,12 @@ from sqladmin import Admin
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from ..configuration import conf
+from ..utils.render_pool import report_renderer
 from .auth import AdminAuth
 from .settings import engine
 from .views import ADMIN_VIEWS
 
-app = FastAPI()
+app = FastAPI(on_shutdown=[report_renderer.shutdown])
 authentication_backend = AdminAuth(secret_key=conf.SECRET_KEY)
 admin = Admin(
     app=app,
@@ -1,33 +1,97 @@
 import asyncio
+import hashlib
 import io
 import json
+from datetime import datetime, timedelta
 
-import pandas as pd
-
-# ReportLab imports
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from sqladmin import BaseView, ModelView, expose
-from sqlalchemy import func, select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import async_sessionmaker
-from sqlalchemy.orm import selectinload
-from starlette.responses import StreamingResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
+from src.cache import Cache, DashboardCache, ReportCache
+from src.configuration import conf
 from src.db.models.department import Department
 from src.db.models.establishment import Establishment
-from src.db.models.transaction import Transaction, TransactionStatus
+from src.db.models.transaction import Transaction, TransactionStatus, TransactionType
 from src.db.models.user import User
-
+from src.errors.custom import RenderQueueFullError, ValidationError
+from src.repositories.transaction import TransactionRepo
+from src.services.dashboard import (
+    TIME_SERIES_GROUPS,
+    DashboardService,
+    department_spending_query,
+    establishment_spending_query,
+    spending_filters,
+)
+from src.services.user_import import UserImportService
+from src.utils.export_writer import (
+    CSV_MEDIA_TYPE,
+    XLSX_MEDIA_TYPE,
+    StreamingExcelWriter,
+    iter_csv,
+    iter_file,
+)
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.utils.pdf_write import write_statistics_pdf
+from src.utils.periods import GRANULARITIES, day_bounds
+from src.utils.render_pool import report_renderer
+
+from .counting import EstimatedCountMixin
+from .search import IndexedSearchMixin, user_name_condition
 from .settings import engine
 
+TRANSACTIONS_PAGE_SIZE = 50
+IMPORT_ERRORS_SHOWN = 200
+RENDER_RETRY_AFTER = 30
+""" Seconds an admin is asked to wait when the report renderer is full """
+
+
+def parse_date_range(params) -> dict:
+    """Turn date_from and date_to query params into a half-open range.
+
+    :raises ValueError: When a date is malformed
+    """
+    date_from = params.get("date_from")
+    date_to = params.get("date_to")
+    return {
+        "start_date": datetime.fromisoformat(date_from) if date_from else None,
+        "end_date": datetime.fromisoformat(date_to) + timedelta(days=1)
+        if date_to
+        else None,
+    }
+
+
+def parse_transaction_filters(params) -> dict:
+    """Turn query params into TransactionRepo.get_page filters.
+
+    :raises ValueError: When a param is malformed
+    """
+    establishment_id = params.get("establishment_id")
+    return {
+        "status": TransactionStatus(params["status"]) if params.get("status") else None,
+        "type": TransactionType(params["type"]) if params.get("type") else None,
+        "establishment_id": int(establishment_id) if establishment_id else None,
+        **parse_date_range(params),
+    }
+
+
+def parse_spending_filters(params) -> dict:
+    """Turn query params into spending_filters arguments.
+
+    :raises ValueError: When a param is malformed
+    """
+    status = params.get("status", TransactionStatus.COMPLETED.value)
+    return {
+        "status": None if status == "all" else TransactionStatus(status),
+        **parse_date_range(params),
+    }
+
+
 # --- Other imports and model definitions ---
 
 
-class UserAdmin(ModelView, model=User):
+class UserAdmin(IndexedSearchMixin, EstimatedCountMixin, ModelView, model=User):
     column_list = [
         User.id,
         User.telegram_id,
@@ -38,7 +102,13 @@ class UserAdmin(ModelView, model=User):
     ]
     can_create = True
     can_delete = True
-    column_searchable_list = [User.username, User.first_name, User.last_name]
+    column_searchable_list = [
+        User.id,
+        User.telegram_id,
+        User.username,
+        User.first_name,
+        User.last_name,
+    ]
     column_details_list = [
         User.id,
         User.telegram_id,
@@ -64,6 +134,12 @@ class UserAdmin(ModelView, model=User):
     icon = "fa-solid fa-user"
     name_plural = "Foydalanuvchilar"
 
+    def numeric_search(self, number: int):
+        return or_(User.id == number, User.telegram_id == number)
+
+    def text_search(self, pattern: str):
+        return user_name_condition(pattern)
+
 
 class DepartmentAdmin(ModelView, model=Department):
     column_list = [Department.id, Department.name, Department.description, "users"]
@@ -91,7 +167,9 @@ class EstablishmentAdmin(ModelView, model=Establishment):
     ]
 
 
-class TransactionAdmin(ModelView, model=Transaction):
+class TransactionAdmin(
+    IndexedSearchMixin, EstimatedCountMixin, ModelView, model=Transaction
+):
     column_list = [
         Transaction.id,
         Transaction.user_id,
@@ -106,7 +184,16 @@ class TransactionAdmin(ModelView, model=Transaction):
     can_create = False
     can_edit = False
     can_delete = True
-    column_searchable_list = [Transaction.id, Transaction.user_id]
+    # Matches idx_transactions_created_at_id, pages are read from the index
+    column_default_sort = [(Transaction.created_at, True), (Transaction.id, True)]
+    column_searchable_list = [
+        Transaction.id,
+        Transaction.user_id,
+        "user.telegram_id",
+        "user.username",
+        "user.first_name",
+        "user.last_name",
+    ]
     column_details_list = [
         Transaction.id,
         "user",
@@ -133,6 +220,28 @@ class TransactionAdmin(ModelView, model=Transaction):
         Transaction.created_at,
     ]
 
+    def numeric_search(self, number: int):
+        return or_(
+            Transaction.id == number,
+            Transaction.user_id == number,
+            Transaction.user_id.in_(select(User.id).where(User.telegram_id == number)),
+        )
+
+    def text_search(self, pattern: str):
+        return Transaction.user_id.in_(
+            select(User.id).where(user_name_condition(pattern))
+        )
+
+    _report_cache: ReportCache | None = None
+
+    async def after_model_delete(self, model: Transaction, request) -> None:
+        """Make cached reports of the establishment stale."""
+        if not model.establishment_id:
+            return
+        if self._report_cache is None:
+            self._report_cache = ReportCache(Cache())
+        await self._report_cache.invalidate(model.establishment_id)
+
 
 class GlobalStatistics(BaseView):
     name = "Global Statistics"
@@ -140,268 +249,257 @@ class GlobalStatistics(BaseView):
 
     def __init__(self):
         self.async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        self.dashboard_service = DashboardService(self.async_session_factory)
+        self._dashboard_cache: DashboardCache | None = None
 
-        try:
-            pdfmetrics.registerFont(TTFont('DejaVuSans', 'DejaVuSans.ttf'))
-            pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', 'DejaVuSans-Bold.ttf'))
-        except Exception:
-            # Fallback for systems where the font might not be in the local path
-            try:
-                pdfmetrics.registerFont(TTFont('DejaVuSans', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'))
-                pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'))
-            except Exception as e:
-                print(f"Warning: Could not register DejaVuSans font. PDF export may fail for Cyrillic. Error: {e}")
+    def get_dashboard_cache(self) -> DashboardCache:
+        """Dashboard snapshot cache, created inside the running event loop.
 
+        Not a property, sqladmin inspects every attribute of the view when it
+        is registered.
+        """
+        if self._dashboard_cache is None:
+            self._dashboard_cache = DashboardCache(Cache())
+        return self._dashboard_cache
 
     @expose("/dashboard", methods=["GET"])
     async def dashboard(self, request):
+        snapshot = await self.get_dashboard_cache().get(
+            self.dashboard_service.get_statistics
+        )
+        return await self.templates.TemplateResponse(
+            request,
+            "dashboard.html",
+            {
+                **snapshot.data,
+                "establishment_chart_data": json.dumps(
+                    snapshot.data["establishment_chart_data"]
+                ),
+                "computed_at": snapshot.computed_at.strftime("%Y-%m-%d %H:%M:%S"),
+            },
+        )
+
+    @expose("/transactions", methods=["GET"])
+    async def transactions_page(self, request):
+        """Return a page of transactions as JSON.
+
+        Pages are addressed by the cursor of the previous one, query params:
+        cursor, limit, status, type, establishment_id, date_from and date_to.
+        """
+        params = request.query_params
+        try:
+            limit = max(min(int(params.get("limit", TRANSACTIONS_PAGE_SIZE)), 200), 1)
+            before = decode_cursor(params["cursor"]) if params.get("cursor") else None
+            filters = parse_transaction_filters(params)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+
         async with self.async_session_factory() as session:
-            # ✅ Overall company statistics
-            total_users_count = await session.scalar(select(func.count(User.id)))
-            total_spending = (
-                await session.scalar(
-                    select(func.sum(Transaction.amount)).where(
-                        Transaction.status == TransactionStatus.COMPLETED
-                    )
-                )
-                or 0
-            )
-            active_establishments_count = await session.scalar(
-                select(func.count(Establishment.id)).where(
-                    Establishment.is_active == True
-                )
+            rows = await TransactionRepo(session).get_page(
+                before=before, limit=limit, **filters
             )
 
-            # ✅ Spending by department
-            department_spending_query = (
-                select(Department.name, func.sum(Transaction.amount))
-                .select_from(Department)
-                .join(User, User.department_id == Department.id)
-                .join(Transaction, Transaction.user_id == User.id)
-                .where(Transaction.status == TransactionStatus.COMPLETED)
-                .group_by(Department.name)
+        items = [
+            {
+                "id": row.id,
+                "user": row.user_name,
+                "establishment": row.establishment_name,
+                "amount": str(row.amount),
+                "type": row.type,
+                "status": row.status,
+                "created_at": row.created_at.strftime("%Y-%m-%d %H:%M"),
+            }
+            for row in rows
+        ]
+        next_cursor = (
+            encode_cursor(rows[-1].created_at, rows[-1].id)
+            if len(rows) == limit
+            else None
+        )
+        return JSONResponse({"items": items, "next_cursor": next_cursor})
+
+    @expose("/timeseries", methods=["GET"])
+    async def timeseries(self, request):
+        """Return completed spending per time bucket as JSON.
+
+        Query params: granularity (hour, day or week), group_by
+        (establishment or department), date_from, date_to and max_points.
+        Responses carry an ETag and If-None-Match is answered with 304.
+        """
+        params = request.query_params
+        granularity = params.get("granularity", "day")
+        group_by = params.get("group_by", "establishment")
+        if granularity not in GRANULARITIES or group_by not in TIME_SERIES_GROUPS:
+            return JSONResponse({"error": "Invalid granularity or group_by"}, 400)
+        try:
+            today, tomorrow = day_bounds()
+            date_from = params.get("date_from")
+            date_to = params.get("date_to")
+            start_date = (
+                datetime.fromisoformat(date_from)
+                if date_from
+                else today - timedelta(days=29)
             )
-            department_spending_result = await session.execute(
-                department_spending_query
+            end_date = (
+                datetime.fromisoformat(date_to) + timedelta(days=1)
+                if date_to
+                else tomorrow
             )
-            department_spending = department_spending_result.fetchall()
-
-            # ✅ Spending by establishment
-            establishment_spending_query = (
-                select(Establishment.name, func.sum(Transaction.amount))
-                .select_from(Establishment)
-                .join(Transaction, Transaction.establishment_id == Establishment.id)
-                .where(Transaction.status == TransactionStatus.COMPLETED)
-                .group_by(Establishment.name)
+            max_points = min(
+                int(params.get("max_points", conf.admin.timeseries_max_points)),
+                conf.admin.timeseries_max_points,
             )
-            establishment_spending_result = await session.execute(
-                establishment_spending_query
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        if start_date >= end_date or max_points < 1:
+            return JSONResponse({"error": "Empty range"}, status_code=400)
+
+        series = await self.dashboard_service.get_time_series(
+            granularity, group_by, start_date, end_date, max_points
+        )
+        body = json.dumps(series, ensure_ascii=False).encode()
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    @expose("/download_stats", methods=["GET"])
+    async def download_stats(self, request):
+        """Download spending per department and establishment.
+
+        Query params: format (excel, csv or pdf), status (a transaction status
+        or "all", completed by default), date_from and date_to.
+        """
+        params = request.query_params
+        format_type = params.get("format", "excel")
+        try:
+            conditions = spending_filters(**parse_spending_filters(params))
+        except ValueError as e:
+            return Response(str(e), status_code=400, media_type="text/plain")
+
+        sections = [
+            (
+                "Расходы по отделам",
+                ["Отдел", "Сумма расходов"],
+                department_spending_query(*conditions),
+            ),
+            (
+                "Расходы по заведениям",
+                ["Заведение", "Сумма расходов"],
+                establishment_spending_query(*conditions),
+            ),
+        ]
+
+        if format_type == "csv":
+            return StreamingResponse(
+                iter_csv(
+                    (title, header, self.dashboard_service.stream("export.stats", q))
+                    for title, header, q in sections
+                ),
+                media_type=CSV_MEDIA_TYPE,
+                headers={"Content-Disposition": "attachment; filename=statistics.csv"},
             )
-            establishment_spending = establishment_spending_result.fetchall()
-
-            # ✅ Calculate spending percentage by establishment (shares)
-            establishment_data_with_shares = []
-            for name, spending in establishment_spending:
-                share = (spending / total_spending) * 100 if total_spending > 0 else 0
-                establishment_data_with_shares.append(
-                    {
-                        "name": name,
-                        "spending": float(spending),
-                        "share": round(float(share), 2),
-                    }
-                )
 
-            # ✅ View all transactions
-            all_transactions_query = (
-                select(Transaction)
-                .options(
-                    selectinload(Transaction.user),
-                    selectinload(Transaction.establishment),
+        elif format_type == "excel":
+            writer = StreamingExcelWriter()
+            for title, header, query in sections:
+                await writer.add_sheet(
+                    title, header, self.dashboard_service.stream("export.stats", query)
                 )
-                .order_by(Transaction.created_at.desc())
+            return StreamingResponse(
+                iter_file(await writer.close()),
+                media_type=XLSX_MEDIA_TYPE,
+                headers={"Content-Disposition": "attachment; filename=statistics.xlsx"},
             )
-            all_transactions_result = await session.execute(all_transactions_query)
-            all_transactions = all_transactions_result.scalars().all()
-
-            # ✅ View expenses for each user (by department)
-            user_spending_query = (
-                select(
-                    User,
-                    Department.name.label("department_name"),
-                    func.sum(Transaction.amount).label("total_spent"),
+
+        elif format_type == "pdf":
+            department_spending, establishment_spending = await asyncio.gather(
+                *(
+                    self.dashboard_service.fetch("export.stats", query)
+                    for _, _, query in sections
                 )
-                .join(Transaction, Transaction.user_id == User.id)
-                .join(Department, User.department_id == Department.id, isouter=True)
-                .where(Transaction.status == TransactionStatus.COMPLETED)
-                .group_by(User.id, Department.name)
-                .order_by(func.sum(Transaction.amount).desc())
             )
-            user_spending_result = await session.execute(user_spending_query)
-            user_spending_by_department = user_spending_result.all()
-
-            # Data for charting (remains unchanged)
-            establishment_chart_data = [
-                {"name": name, "spending": float(spending)}
-                for name, spending in establishment_spending
-            ]
-
-            return await self.templates.TemplateResponse(
-                request,
-                "dashboard.html",
-                {
-                    "total_users": total_users_count,
-                    "total_spending": total_spending,
-                    "active_establishments": active_establishments_count,
-                    "department_spending": department_spending,
-                    "establishment_spending_with_shares": establishment_data_with_shares,
-                    "all_transactions": all_transactions,
-                    "user_spending_by_department": user_spending_by_department,
-                    "establishment_chart_data": json.dumps(establishment_chart_data),
-                },
+            # Use the new, direct PDF generation method
+            try:
+                pdf_buffer = await self._generate_pdf_report(
+                    department_spending, establishment_spending
+                )
+            except RenderQueueFullError:
+                return Response(
+                    "Сейчас формируется много отчётов, повторите попытку позже",
+                    status_code=503,
+                    media_type="text/plain",
+                    headers={"Retry-After": str(RENDER_RETRY_AFTER)},
+                )
+            return StreamingResponse(
+                iter_file(pdf_buffer),
+                media_type="application/pdf",
+                headers={"Content-Disposition": "attachment; filename=statistics.pdf"},
             )
 
-    @expose("/download_stats", methods=["GET"])
-    async def download_stats(self, request):
+        return Response("Unsupported format", status_code=400, media_type="text/plain")
+
+    @expose("/export_transactions", methods=["GET"])
+    async def export_transactions(self, request):
+        """Download every transaction as a workbook built in constant memory."""
         async with self.async_session_factory() as session:
-            format_type = request.query_params.get("format", "excel")
-
-            total_spending_by_department_query = (
-                select(Department.name, func.sum(Transaction.amount))
-                .select_from(Department)
-                .join(User, User.department_id == Department.id)
-                .join(Transaction, Transaction.user_id == User.id)
-                .group_by(Department.name)
+            writer = StreamingExcelWriter()
+            await writer.add_sheet(
+                "Transactions",
+                ["ID", "Дата", "Пользователь", "Заведение", "Сумма", "Тип", "Статус"],
+                TransactionRepo(session).stream_export_rows(),
             )
-            department_spending = await session.execute(
-                total_spending_by_department_query
+            return StreamingResponse(
+                iter_file(await writer.close()),
+                media_type=XLSX_MEDIA_TYPE,
+                headers={
+                    "Content-Disposition": "attachment; filename=transactions.xlsx"
+                },
             )
-            department_spending = department_spending.fetchall()
 
-            total_spending_by_establishment_query = (
-                select(Establishment.name, func.sum(Transaction.amount))
-                .select_from(Establishment)
-                .join(Transaction, Transaction.establishment_id == Establishment.id)
-                .group_by(Establishment.name)
-            )
-            establishment_spending = await session.execute(
-                total_spending_by_establishment_query
-            )
-            establishment_spending = establishment_spending.fetchall()
+    async def _generate_pdf_report(
+        self, dept_spending: list, est_spending: list
+    ) -> io.BytesIO:
+        """Render the statistics PDF in the shared report worker pool."""
+        content = await report_renderer.render(
+            write_statistics_pdf,
+            [tuple(row) for row in dept_spending],
+            [tuple(row) for row in est_spending],
+        )
+        return io.BytesIO(content)
 
-            df_dept = pd.DataFrame(
-                department_spending, columns=["Department", "Total Spending"]
-            )
-            df_est = pd.DataFrame(
-                establishment_spending, columns=["Establishment", "Total Spending"]
-            )
 
-            output = io.BytesIO()
-
-            df_dept = pd.DataFrame(department_spending, columns=["Отдел", "Сумма расходов"])
-            df_est = pd.DataFrame(establishment_spending, columns=["Заведение", "Сумма расходов"])
-
-            if format_type == "excel":
-                with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-                    df_dept.to_excel(
-                        writer, sheet_name="Department Spending", index=False
-                    )
-                    df_est.to_excel(
-                        writer, sheet_name="Establishment Spending", index=False
-                    )
-                output.seek(0)
-                return StreamingResponse(
-                    output,
-                    media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    headers={
-                        "Content-Disposition": "attachment; filename=statistics.xlsx"
-                    },
-                )
+class UserImport(BaseView):
+    name = "Импорт сотрудников"
+    icon = "fa-solid fa-file-import"
 
-            elif format_type == "pdf":
-                # Use the new, direct PDF generation method
-                pdf_buffer = await asyncio.to_thread(
-                    self._generate_pdf_report, department_spending, establishment_spending
-                )
-                return StreamingResponse(
-                    pdf_buffer,
-                    media_type="application/pdf",
-                    headers={"Content-Disposition": "attachment; filename=statistics.pdf"}
-                )
-
-            return StreamingResponse(
-                io.BytesIO(b"Unsupported format"),
-                status_code=400,
-                media_type="text/plain",
-            )
+    def __init__(self):
+        self.async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
 
-    def _generate_pdf_report(self, dept_spending: list, est_spending: list) -> io.BytesIO:
-        """
-        Generates a PDF report from statistics data, writing it to an in-memory buffer.
-        """
-        output = io.BytesIO()
-        doc = SimpleDocTemplate(output, pagesize=letter)
-        styles = getSampleStyleSheet()
-        elements = []
-
-        # Define custom styles using the registered Cyrillic-compatible font
-        title_style = styles["Title"]
-        title_style.fontName = 'DejaVuSans-Bold'
-
-        header_style = styles["h2"]
-        header_style.fontName = 'DejaVuSans-Bold'
-
-        # Main Title
-        elements.append(Paragraph("Статистический отчет", title_style))
-        elements.append(Spacer(1, 24))
-
-        # Department Spending Table
-        elements.append(Paragraph("Расходы по отделам", header_style))
-        elements.append(Spacer(1, 12))
-
-        # Manually construct table data with a header row
-        dept_table_data = [["Отдел", "Сумма расходов"]]
-        for name, spending in dept_spending:
-            dept_table_data.append([name, f"{spending:,.2f} UZS"])
-
-        dept_table = Table(dept_table_data, colWidths=[250, 150])
-        dept_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'DejaVuSans-Bold'), # Bold header
-            ('FONTNAME', (0, 1), (-1, -1), 'DejaVuSans'),    # Regular body
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-        elements.append(dept_table)
-        elements.append(Spacer(1, 24))
-
-        # Establishment Spending Table
-        elements.append(Paragraph("Расходы по заведениям", header_style))
-        elements.append(Spacer(1, 12))
-
-        # Manually construct table data for the second table
-        est_table_data = [["Заведение", "Сумма расходов"]]
-        for name, spending in est_spending:
-            est_table_data.append([name, f"{spending:,.2f} UZS"])
-
-        est_table = Table(est_table_data, colWidths=[250, 150])
-        est_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'DejaVuSans-Bold'), # Bold header
-            ('FONTNAME', (0, 1), (-1, -1), 'DejaVuSans'),    # Regular body
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-        elements.append(est_table)
-
-        doc.build(elements)
-        output.seek(0)
-        return output
+    @expose("/import_users", methods=["GET", "POST"])
+    async def import_users(self, request):
+        """Upsert employees and departments of an uploaded XLSX or CSV file."""
+        context = {"errors_shown": IMPORT_ERRORS_SHOWN}
+        if request.method == "POST":
+            form = await request.form()
+            upload = form.get("file")
+            if not upload or not upload.filename:
+                context["error"] = "Выберите файл"
+            else:
+                try:
+                    async with self.async_session_factory() as session:
+                        context["result"] = await UserImportService(
+                            session
+                        ).import_file(upload.file, upload.filename)
+                except ValidationError as e:
+                    context["error"] = str(e)
+                finally:
+                    await upload.close()
+
+        return await self.templates.TemplateResponse(
+            request, "user_import.html", context
+        )
 
 
 ADMIN_VIEWS = [
@@ -411,5 +509,6 @@ ADMIN_VIEWS = [
     TransactionAdmin,
     # ReportAdmin,
     GlobalStatistics,
+    UserImport,
     # BalanceHistoryAdmin,
 ]
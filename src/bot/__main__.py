@@ -3,41 +3,25 @@
 import asyncio
 import logging
 
-from aiogram import Bot
-from aiogram.client.default import DefaultBotProperties
-from redis.asyncio.client import Redis
-
-from src.bot.dispatcher import get_dispatcher, get_redis_storage
-from src.bot.structures.data_structure import TransferData
-from src.cache import Cache
+from src.bot.setup import setup_bot
+from src.bot.supervisor import Supervisor
+from src.bot.webhook import run_webhook
 from src.configuration import conf
-from src.db.database import create_async_engine
-from src.language.translator import Translator
 
 
 async def start_bot():
-    """This function will start bot with polling mode."""
-    bot = Bot(token=conf.bot.token, default=DefaultBotProperties(parse_mode="html"))
-    cache = Cache()
-    storage = get_redis_storage(
-        redis=Redis(
-            db=conf.redis.db,
-            host=conf.redis.host,
-            password=conf.redis.passwd,
-            username=conf.redis.username,
-            port=conf.redis.port,
-        )
-    )
-    dp = get_dispatcher(storage=storage)
-
-    await dp.start_polling(
-        bot,
-        allowed_updates=dp.resolve_used_update_types(),
-        **TransferData(
-            engine=create_async_engine(url=conf.db.build_connection_str()), cache=cache
-        ),
-        translator=Translator(),
-    )
+    """This function will start bot with polling or webhook mode."""
+    if conf.bot.workers > 1:
+        await Supervisor(workers=conf.bot.workers).run()
+        return
+
+    bot, dp, data = await setup_bot()
+    if conf.bot.mode == "webhook":
+        await run_webhook(dp, bot, **data)
+        return
+
+    await bot.delete_webhook()
+    await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types(), **data)
 
 
 if __name__ == "__main__":
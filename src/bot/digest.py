@@ -0,0 +1,160 @@
+"""Daily revenue digests pushed to establishment owners at closing time.
+
+Figures of every establishment are computed in one grouped query, and
+messages go out through a sender which keeps below the Telegram broadcast
+limit. A Redis key makes sure only one bot process sends the digest of a day.
+"""
+
+import asyncio
+import html
+import logging
+from collections.abc import Iterable
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.cache import Cache
+from src.configuration import conf
+from src.schemas.report import EstablishmentDigest
+from src.services.digest import DigestService
+
+DIGEST_LOCK_TTL = 24 * 60 * 60
+DIGEST_RETRY_DELAY = 5 * 60
+""" Seconds before a failed digest is tried again by the same process """
+DIGEST_ATTEMPTS = 3
+
+
+def format_digest(digests: list[EstablishmentDigest]) -> str:
+    """Build the digest message of one owner."""
+    lines = [f"📊 <b>{digests[0].day:%d.%m.%Y} kunlik hisobot</b>"]
+    for digest in digests:
+        lines.append(
+            f"\n<b>{html.escape(digest.name)}</b>\n"
+            f"Daromad: {digest.revenue:,.2f} so'm\n"
+            f"Buyurtmalar: {digest.orders}\n"
+            f"Xodimlar: {digest.customers}\n"
+            f"O'rtacha buyurtma: {digest.average_order_value:,.2f} so'm"
+        )
+    return "\n".join(lines)
+
+
+class RateLimitedSender:
+    """Sends messages in concurrent batches of at most rate per second."""
+
+    def __init__(self, bot: Bot, rate: int = conf.digest.rate_limit):
+        self.bot = bot
+        self.rate = rate
+
+    async def send_all(self, messages: Iterable[tuple[int, str]]) -> int:
+        """Send messages to their chats.
+
+        :param messages: Pairs of chat id and text
+        :return: Number of delivered messages.
+        """
+        loop = asyncio.get_running_loop()
+        messages = iter(messages)
+        delivered = 0
+        while batch := list(islice(messages, self.rate)):
+            started = loop.time()
+            results = await asyncio.gather(
+                *(self._send(chat_id, text) for chat_id, text in batch)
+            )
+            delivered += sum(results)
+            elapsed = loop.time() - started
+            if elapsed < 1:
+                await asyncio.sleep(1 - elapsed)
+        return delivered
+
+    async def _send(self, chat_id: int, text: str, retry: bool = True) -> bool:
+        try:
+            await self.bot.send_message(chat_id, text)
+        except TelegramRetryAfter as e:
+            if not retry:
+                return False
+            await asyncio.sleep(e.retry_after)
+            return await self._send(chat_id, text, retry=False)
+        except TelegramAPIError as e:
+            logging.warning("Could not send the digest to %s: %s", chat_id, e)
+            return False
+        return True
+
+
+class DigestScheduler:
+    """Sends the daily digest every day at the closing time."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        engine: AsyncEngine,
+        cache: Cache,
+        send_at: time = time.fromisoformat(conf.digest.send_at),
+    ):
+        self.bot = bot
+        self.engine = engine
+        self.cache = cache
+        self.send_at = send_at
+        self.sender = RateLimitedSender(bot)
+        self._task: asyncio.Task | None = None
+
+    def next_run(self, now: datetime) -> datetime:
+        """Closing time of today, or of tomorrow when it has passed."""
+        run_at = datetime.combine(now.date(), self.send_at)
+        return run_at if run_at > now else run_at + timedelta(days=1)
+
+    async def start(self) -> None:
+        """Start waiting for the closing time."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the scheduler."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self, moment: datetime) -> int:
+        """Send digests of the day of the moment unless already sent.
+
+        The day is released again when computing or sending fails, so it can
+        be retried.
+
+        :return: Number of delivered digests.
+        """
+        lock_key = f"digest:{moment:%Y-%m-%d}"
+        if not await self.cache.redis_client.set(
+            lock_key, 1, nx=True, ex=DIGEST_LOCK_TTL
+        ):
+            return 0
+
+        try:
+            async with AsyncSession(bind=self.engine) as session:
+                digests = await DigestService(session).get_daily_digests(moment)
+            return await self.sender.send_all(
+                (telegram_id, format_digest(items))
+                for telegram_id, items in digests.items()
+            )
+        except (Exception, asyncio.CancelledError):
+            await self.cache.redis_client.delete(lock_key)
+            raise
+
+    async def _run(self) -> None:
+        while True:
+            now = datetime.now()
+            run_at = self.next_run(now)
+            await asyncio.sleep((run_at - now).total_seconds())
+            for attempt in range(1, DIGEST_ATTEMPTS + 1):
+                try:
+                    delivered = await self.run_once(run_at)
+                    logging.info("Sent %s daily digests", delivered)
+                    break
+                except Exception:
+                    logging.exception(
+                        "Daily digest failed, attempt %s of %s",
+                        attempt,
+                        DIGEST_ATTEMPTS,
+                    )
+                    if attempt < DIGEST_ATTEMPTS:
+                        await asyncio.sleep(DIGEST_RETRY_DELAY)
@@ -2,17 +2,25 @@
 
 from aiogram import Dispatcher
 from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage
-from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.memory import MemoryStorage, SimpleEventIsolation
 from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.fsm.strategy import FSMStrategy
 from redis.asyncio.client import Redis
 
+from src.bot.isolation import MeasuredRedisEventIsolation
 from src.bot.middlewares.database_md import DatabaseMiddleware
+from src.bot.middlewares.priority_md import PriorityMiddleware
+from src.bot.middlewares.throttling_md import ThrottleLimit, ThrottlingMiddleware
 from src.bot.middlewares.translator_md import TranslatorMiddleware
 from src.configuration import conf
 
 from .logic import routers
 
+# Buckets shared by every handler of a router, on top of the per user one
+ROUTER_THROTTLE_LIMITS = {
+    "establishment": ThrottleLimit(rate=1, burst=5),
+}
+
 
 def get_redis_storage(
     redis: Redis, state_ttl=conf.redis.state_ttl, data_ttl=conf.redis.data_ttl
@@ -29,6 +37,33 @@ def get_redis_storage(
     return RedisStorage(redis=redis, state_ttl=state_ttl, data_ttl=data_ttl)
 
 
+def get_event_isolation(
+    redis: Redis,
+    mode: str = conf.bot.event_isolation,
+    lock_timeout: float = conf.bot.lock_timeout,
+    wait_timeout: float | None = conf.bot.lock_wait_timeout,
+) -> BaseEventIsolation:
+    """This function create per chat isolation of updates.
+
+    :param redis: Redis client instance, the one of the FSM storage
+    :param mode: "redis" to isolate chats across bot replicas, "memory" to
+    isolate them within this process only
+    :param lock_timeout: Seconds a chat lock lives
+    :param wait_timeout: Seconds an update waits for its chat lock
+    :return: Created event isolation.
+    """
+    if mode == "memory":
+        return SimpleEventIsolation()
+    return MeasuredRedisEventIsolation(
+        redis=redis,
+        lock_kwargs={
+            "timeout": lock_timeout,
+            "blocking_timeout": wait_timeout,
+            "sleep": 0.05,
+        },
+    )
+
+
 def get_dispatcher(
     storage: BaseStorage = MemoryStorage(),
     fsm_strategy: FSMStrategy | None = FSMStrategy.CHAT,
@@ -43,11 +78,22 @@ def get_dispatcher(
     for router in routers:
         dp.include_router(router)
 
-    # Register middlewares
+    # Register middlewares, throttling first so rejected updates open no session
+    throttling = ThrottlingMiddleware(router_limits=ROUTER_THROTTLE_LIMITS)
+    dp.message.middleware(throttling)
+    dp.callback_query.middleware(throttling)
+
+    # Lanes bound the sessions open at once, so they wait before the database
+    priority = PriorityMiddleware()
+    dp.message.middleware(priority)
+    dp.callback_query.middleware(priority)
+
     dp.message.middleware(DatabaseMiddleware())
     dp.callback_query.middleware(DatabaseMiddleware())
 
-    dp.message.middleware(TranslatorMiddleware())
-    dp.callback_query.middleware(TranslatorMiddleware())
+    # One instance, so messages and callback queries share cached locales
+    translator = TranslatorMiddleware()
+    dp.message.middleware(translator)
+    dp.callback_query.middleware(translator)
 
     return dp
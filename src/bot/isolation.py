@@ -0,0 +1,129 @@
+"""Per chat event isolation shared by every bot replica.
+
+Updates of one chat take a Redis lock before they reach the handlers, so the
+FSM state of a chat is never processed by two replicas at once. Lock waits
+and hold times are collected per process and logged on shutdown.
+"""
+
+import logging
+import time
+from collections import Counter
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import RedisEventIsolation
+from redis.asyncio.lock import Lock
+from redis.exceptions import LockError
+
+SLOW_LOCK_WAIT = 1.0
+""" Seconds of waiting for a chat lock which are logged """
+
+
+@dataclass
+class LockStats:
+    """Chat lock counters."""
+
+    acquired: int = 0
+    contended: int = 0
+    """ Acquisitions which had to wait for another update of the chat """
+    timeouts: int = 0
+    wait_seconds: float = 0.0
+    max_wait: float = 0.0
+    max_hold: float = 0.0
+
+
+class LockMetrics:
+    """Collects chat lock statistics of the process."""
+
+    def __init__(self, top: int = 10, max_chats: int = 10_000):
+        """Initialize metrics.
+
+        :param top: Most contended chats reported
+        :param max_chats: Contended chats remembered before the rarest are
+        dropped.
+        """
+        self.top = top
+        self.max_chats = max_chats
+        self.stats = LockStats()
+        self._contended_chats: Counter[int] = Counter()
+
+    def record(self, chat_id: int, wait: float | None, hold: float) -> None:
+        """Count one acquisition.
+
+        :param wait: Seconds waited for the lock, None when it was free
+        :param hold: Seconds the lock was held
+        """
+        self.stats.acquired += 1
+        self.stats.max_hold = max(self.stats.max_hold, hold)
+        if wait is None:
+            return
+
+        self.stats.contended += 1
+        self.stats.wait_seconds += wait
+        self.stats.max_wait = max(self.stats.max_wait, wait)
+        self._contended_chats[chat_id] += 1
+        if len(self._contended_chats) > self.max_chats:
+            self._contended_chats = Counter(
+                dict(self._contended_chats.most_common(self.max_chats // 2))
+            )
+
+    def record_timeout(self) -> None:
+        """Count a lock which was not acquired in time."""
+        self.stats.timeouts += 1
+
+    def report(self) -> dict:
+        """Statistics collected so far."""
+        contended = self.stats.contended
+        return {
+            "acquired": self.stats.acquired,
+            "contended": contended,
+            "timeouts": self.stats.timeouts,
+            "average_wait": self.stats.wait_seconds / contended if contended else 0.0,
+            "max_wait": self.stats.max_wait,
+            "max_hold": self.stats.max_hold,
+            "most_contended_chats": self._contended_chats.most_common(self.top),
+        }
+
+
+lock_metrics = LockMetrics()
+
+
+class MeasuredRedisEventIsolation(RedisEventIsolation):
+    """RedisEventIsolation recording how long chats wait for their lock.
+
+    A free lock is taken in a single round trip. Only a busy one falls back to
+    polling, which is when the wait is measured.
+    """
+
+    def __init__(self, *args, metrics: LockMetrics = lock_metrics, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics
+
+    @asynccontextmanager
+    async def lock(self, key: StorageKey) -> AsyncGenerator[None, None]:
+        """Hold the lock of the chat while its update is handled."""
+        lock = self.redis.lock(
+            name=self.key_builder.build(key, "lock"),
+            **self.lock_kwargs,
+            lock_class=Lock,
+        )
+        wait = None
+        if not await lock.acquire(blocking=False):
+            started = time.monotonic()
+            acquired = await lock.acquire()
+            wait = time.monotonic() - started
+            if not acquired:
+                self.metrics.record_timeout()
+                logging.warning("Chat %s lock not acquired in %.2fs", key.chat_id, wait)
+                raise LockError("Unable to acquire lock within the time specified")
+            if wait > SLOW_LOCK_WAIT:
+                logging.warning("Chat %s waited %.1fs for its lock", key.chat_id, wait)
+
+        taken = time.monotonic()
+        try:
+            yield None
+        finally:
+            self.metrics.record(key.chat_id, wait, time.monotonic() - taken)
+            await lock.release()
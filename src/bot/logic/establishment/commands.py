@@ -1,15 +1,29 @@
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
-from pathlib import Path
 
 from aiogram import F, types
 from aiogram.fsm.context import FSMContext
 
+from src.bot.middlewares.priority_md import REPORT_LANE
+from src.bot.middlewares.throttling_md import ThrottleLimit
+from src.bot.report_worker import REPORT_CAPTIONS
 from src.bot.structures.fsm.establishment import ProcessEstablishment
 from src.bot.structures.keyboards import common
+from src.cache import Cache, ReportCache
+from src.cache.reports import ReportKey
+from src.errors.custom import RenderQueueFullError
+from src.schemas.report import ReportFile
 from src.services.tg_bot_service import TelegramBotService
+from src.utils.periods import day_bounds
 
 from .router import establishment_router
 
+REPORTS_BUSY_TEXT = "Hozir hisobotlar ko'p, birozdan so'ng qayta urinib ko'ring."
+REPORT_QUEUED_TEXT = "Hisobot tayyorlanmoqda, tayyor bo'lishi bilan yuboriladi."
+REPORT_ALREADY_QUEUED_TEXT = "Bu hisobot allaqachon tayyorlanmoqda."
+REPORT_PERIOD_DAYS = {"Kunlik": 1, "Haftalik": 7, "Oylik": 30}
+REPORT_THROTTLE = ThrottleLimit(rate=1 / 30, burst=2)
+
 
 @establishment_router.message(F.text == "⬅️ Orqaga")
 async def go_back(
@@ -50,7 +64,11 @@ async def by_date(
     await state.set_state(ProcessEstablishment.send_date_filter)
 
 
-@establishment_router.message(ProcessEstablishment.send_date_filter, F.text == "Kunlik")
+@establishment_router.message(
+    ProcessEstablishment.send_date_filter,
+    F.text == "Kunlik",
+    flags={"lane": REPORT_LANE},
+)
 async def by_daily(
     message: types.Message,
     db: TelegramBotService,
@@ -83,7 +101,9 @@ async def by_daily(
 
 
 @establishment_router.message(
-    ProcessEstablishment.send_date_filter, F.text == "Haftalik"
+    ProcessEstablishment.send_date_filter,
+    F.text == "Haftalik",
+    flags={"lane": REPORT_LANE},
 )
 async def by_weekly(
     message: types.Message,
@@ -111,7 +131,11 @@ async def by_weekly(
         await message.answer(transactions_message)
 
 
-@establishment_router.message(ProcessEstablishment.send_date_filter, F.text == "Oylik")
+@establishment_router.message(
+    ProcessEstablishment.send_date_filter,
+    F.text == "Oylik",
+    flags={"lane": REPORT_LANE},
+)
 async def by_monthly(
     message: types.Message,
     db: TelegramBotService,
@@ -138,7 +162,9 @@ async def by_monthly(
         await message.answer(transactions_message)
 
 
-@establishment_router.message(ProcessEstablishment.send_date_filter, F.text)
+@establishment_router.message(
+    ProcessEstablishment.send_date_filter, F.text, flags={"lane": REPORT_LANE}
+)
 async def by_data(
     message: types.Message,
     db: TelegramBotService,
@@ -195,7 +221,9 @@ async def start_handler(
     await state.set_state(ProcessEstablishment.send_id_filter)
 
 
-@establishment_router.message(ProcessEstablishment.send_id_filter, F.text)
+@establishment_router.message(
+    ProcessEstablishment.send_id_filter, F.text, flags={"lane": REPORT_LANE}
+)
 async def start_handler(
     message: types.Message,
     db: TelegramBotService,
@@ -246,51 +274,196 @@ async def establishment_total_profit(
     await message.answer("File turini tanlang", reply_markup=common.choose_file_type())
 
 
-@establishment_router.message(F.text == "PDF")
-async def send_report_pdf(
-    message: types.Message, db: TelegramBotService, state: FSMContext
+def parse_report_period(text: str) -> tuple[datetime, datetime] | None:
+    """Turn a period button or a "01.01.2025-01.06.2025" range into day bounds."""
+    _, tomorrow = day_bounds()
+    if text in REPORT_PERIOD_DAYS:
+        return tomorrow - timedelta(days=REPORT_PERIOD_DAYS[text]), tomorrow
+
+    dates = text.split("-")
+    if len(dates) != 2:
+        return None
+    try:
+        start_date = datetime.strptime(dates[0].strip(), "%d.%m.%Y")
+        end_date = datetime.strptime(dates[1].strip(), "%d.%m.%Y")
+    except ValueError:
+        return None
+    if start_date > end_date:
+        return None
+    return start_date, end_date + timedelta(days=1)
+
+
+async def send_from_cache(
+    message: types.Message, report_cache: ReportCache, key: ReportKey
+) -> bool:
+    """Send a cached report.
+
+    :return: False when the report is not cached.
+    """
+    cached = await report_cache.get(key)
+    if cached is None:
+        return False
+
+    caption = REPORT_CAPTIONS[key.format]
+    if cached.file_id:
+        await message.answer_document(cached.file_id, caption=caption)
+        return True
+
+    sent = await message.answer_document(
+        types.BufferedInputFile(cached.file.content, filename=cached.file.filename),
+        caption=caption,
+    )
+    await report_cache.remember_file_id(key, sent.document.file_id)
+    return True
+
+
+async def send_cached_report(
+    message: types.Message,
+    cache: Cache,
+    establishment_id: int,
+    period: str,
+    report_format: str,
+    render: Callable[[], Awaitable[ReportFile]],
 ):
+    """Send a report, reusing a cached rendering or upload."""
+    report_cache = ReportCache(cache)
+    key = await report_cache.key(
+        establishment_id, period=period, report_format=report_format
+    )
+    if await send_from_cache(message, report_cache, key):
+        return
+
+    try:
+        report = await render()
+    except RenderQueueFullError:
+        return await message.answer(REPORTS_BUSY_TEXT)
+    await report_cache.put(key, report)
+
+    sent = await message.answer_document(
+        types.BufferedInputFile(report.content, filename=report.filename),
+        caption=REPORT_CAPTIONS[report_format],
+    )
+    await report_cache.remember_file_id(key, sent.document.file_id)
+
+
+@establishment_router.message(F.text == "Batafsil hisobot")
+async def detailed_report(message: types.Message, state: FSMContext):
+    await message.answer(
+        "Hisobot davrini tanlang yoki shunday formatda yuboring:\n\n"
+        "<code>01.01.2025-01.06.2025</code>",
+        reply_markup=common.date_filters(),
+    )
+    await state.set_state(ProcessEstablishment.send_report_period)
+
+
+@establishment_router.message(ProcessEstablishment.send_report_period, F.text)
+async def detailed_report_period(message: types.Message, state: FSMContext):
+    period = parse_report_period(message.text)
+    if period is None:
+        return await message.answer(
+            "Sanani to'g'ri formatda kiriting:\n\n<code>01.01.2025-01.06.2025</code>"
+        )
+
+    start_date, end_date = period
+    await state.update_data(
+        report_start=start_date.isoformat(), report_end=end_date.isoformat()
+    )
+    await message.answer("File turini tanlang", reply_markup=common.choose_file_type())
+    await state.set_state(ProcessEstablishment.select_report_format)
+
+
+@establishment_router.message(
+    ProcessEstablishment.select_report_format,
+    F.text.in_({"PDF", "EXCEL"}),
+    flags={"throttle": REPORT_THROTTLE, "lane": REPORT_LANE},
+)
+async def send_detailed_report(
+    message: types.Message, db: TelegramBotService, state: FSMContext, cache: Cache
+):
+    data = await state.get_data()
+    start_date = datetime.fromisoformat(data["report_start"])
+    end_date = datetime.fromisoformat(data["report_end"])
+    report_format = "pdf" if message.text == "PDF" else "xlsx"
     establishment = (
         await db.establishment_service.get_establishment_by_owner_telegram_id(
             owner_telegram_id=message.from_user.id
         )
     )
-    result = await db.establishment_service.get_revenue_summary_in_pdf(establishment.id)
-
-    # result is a relative path like 'reports/filename.pdf'
-
-    file_path = Path(result).resolve()
-    if not file_path.exists():
-        return await message.answer("PDF faylini topib bo'lmadi.")
+    period = f"detailed:{start_date:%Y%m%d}-{end_date:%Y%m%d}"
+    await state.set_state(ProcessEstablishment.select_menu)
 
-    with file_path.open("rb") as pdf_file:
-        await message.answer_document(
-            types.BufferedInputFile(pdf_file.read(), filename=file_path.name),
-            caption="Hisobot PDF fayli",
+    if establishment.owner_id is None:
+        return await send_cached_report(
+            message,
+            cache,
+            establishment.id,
+            period=period,
+            report_format=report_format,
+            render=lambda: db.establishment_service.get_detailed_report(
+                establishment.id, start_date, end_date, report_format
+            ),
         )
 
+    report_cache = ReportCache(cache)
+    key = await report_cache.key(
+        establishment.id, period=period, report_format=report_format
+    )
+    if await send_from_cache(message, report_cache, key):
+        return
+
+    queued = await db.report_queue.enqueue(
+        title=f"Detailed report for {establishment.name}",
+        report_type="detailed",
+        report_format=report_format,
+        parameters={
+            "establishment_id": establishment.id,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "period": period,
+        },
+        generated_by=establishment.owner_id,
+        chat_id=message.chat.id,
+    )
+    await message.answer(REPORT_QUEUED_TEXT if queued else REPORT_ALREADY_QUEUED_TEXT)
 
-@establishment_router.message(F.text == "EXCEL")
-async def send_report_excel(
-    message: types.Message, db: TelegramBotService, state: FSMContext
+
+async def send_revenue_report(
+    message: types.Message, db: TelegramBotService, cache: Cache, report_format: str
 ):
+    """Send the revenue summary of today."""
     establishment = (
         await db.establishment_service.get_establishment_by_owner_telegram_id(
             owner_telegram_id=message.from_user.id
         )
     )
-    result = await db.establishment_service.get_revenue_summary_in_excel(
-        establishment.id
+    if report_format == "pdf":
+        render = db.establishment_service.get_revenue_summary_in_pdf
+    else:
+        render = db.establishment_service.get_revenue_summary_in_excel
+
+    await send_cached_report(
+        message,
+        cache,
+        establishment.id,
+        period=f"summary:{datetime.now().date().isoformat()}",
+        report_format=report_format,
+        render=lambda: render(establishment.id),
     )
 
-    # result is a relative path like 'reports/filename.xlsx'
 
-    file_path = Path(result).resolve()
-    if not file_path.exists():
-        return await message.answer("XLSX faylini topib bo'lmadi.")
+@establishment_router.message(
+    F.text == "PDF", flags={"throttle": REPORT_THROTTLE, "lane": REPORT_LANE}
+)
+async def send_report_pdf(
+    message: types.Message, db: TelegramBotService, state: FSMContext, cache: Cache
+):
+    await send_revenue_report(message, db, cache, "pdf")
 
-    with file_path.open("rb") as xlsx_file:
-        await message.answer_document(
-            types.BufferedInputFile(xlsx_file.read(), filename=file_path.name),
-            caption="Hisobot EXCEL fayli",
-        )
+
+@establishment_router.message(
+    F.text == "EXCEL", flags={"throttle": REPORT_THROTTLE, "lane": REPORT_LANE}
+)
+async def send_report_excel(
+    message: types.Message, db: TelegramBotService, state: FSMContext, cache: Cache
+):
+    await send_revenue_report(message, db, cache, "xlsx")
@@ -3,6 +3,8 @@ from datetime import datetime
 from aiogram import F, types
 from aiogram.fsm.context import FSMContext
 
+from src.bot.middlewares.priority_md import PAYMENT_LANE, REPORT_LANE
+from src.bot.middlewares.throttling_md import ThrottleLimit
 from src.bot.structures.fsm.user import ProcessUser
 from src.bot.structures.keyboards import common
 from src.services.tg_bot_service import TelegramBotService
@@ -10,7 +12,11 @@ from src.services.tg_bot_service import TelegramBotService
 from .router import user_router
 
 
-@user_router.message(ProcessUser.select_menu, F.text == "Tranzaksiyalar")
+@user_router.message(
+    ProcessUser.select_menu,
+    F.text == "Tranzaksiyalar",
+    flags={"throttle": ThrottleLimit(rate=0.2, burst=3), "lane": REPORT_LANE},
+)
 async def start_handler(
     message: types.Message,
     db: TelegramBotService,
@@ -52,7 +58,7 @@ async def start_handler(
     await message.answer(summary_message)
 
 
-@user_router.message(ProcessUser.confirm_purchase, F.text)
+@user_router.message(ProcessUser.confirm_purchase, F.text, flags={"lane": PAYMENT_LANE})
 async def confirm_purchase(
     message: types.Message,
     db: TelegramBotService,
@@ -97,7 +103,11 @@ async def confirm_purchase(
             await state.set_state(ProcessUser.accept_purchase)
 
 
-@user_router.callback_query(ProcessUser.accept_purchase, F.data == "accept_purchase")
+@user_router.callback_query(
+    ProcessUser.accept_purchase,
+    F.data == "accept_purchase",
+    flags={"lane": PAYMENT_LANE},
+)
 async def confirm_handler(
     c: types.CallbackQuery,
     db: TelegramBotService,
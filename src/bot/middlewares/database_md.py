@@ -5,14 +5,17 @@ from typing import Any
 
 from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.structures.data_structure import TransferData
 from src.services.tg_bot_service import TelegramBotService
 
 
 class DatabaseMiddleware(BaseMiddleware):
-    """This middleware throw a Database class to handler."""
+    """This middleware throw a Database class to handler.
+
+    The session is opened from the shared session factory only when a handler
+    first uses a service.
+    """
 
     async def __call__(
         self,
@@ -21,6 +24,9 @@ class DatabaseMiddleware(BaseMiddleware):
         data: TransferData,
     ) -> Any:
         """This method calls every update."""
-        async with AsyncSession(bind=data["engine"]) as session:
-            data["db"] = TelegramBotService(session)
+        db = TelegramBotService(data["session_factory"], cache=data.get("cache"))
+        data["db"] = db
+        try:
             return await handler(event, data)
+        finally:
+            await db.close()
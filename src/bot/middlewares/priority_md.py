@@ -0,0 +1,175 @@
+"""Priority middleware bounds how many updates of each kind run at once.
+
+Handlers belong to a lane by their ``lane`` flag, others to the query lane:
+
+>> @router.message(F.text == "PDF", flags={"lane": "report"})
+
+Every lane has its own semaphore taken before the database session is
+opened, so a burst of reports can not take the connections payments need.
+Lanes which may shed drop updates once too many wait or one waited too long.
+Queue depths and waits are collected per process and logged on shutdown.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import CallbackQuery, Message
+
+from src.bot.structures.data_structure import TransferData
+from src.configuration import conf
+
+SHED_TEXT = "Hozir so'rovlar ko'p, birozdan so'ng qayta urinib ko'ring."
+
+PAYMENT_LANE = "payment"
+QUERY_LANE = "query"
+REPORT_LANE = "report"
+
+
+@dataclass(frozen=True)
+class Lane:
+    """Updates of one kind handled at once."""
+
+    concurrency: int
+    max_waiting: int | None = None
+    """ Updates waiting for a slot before new ones are shed, None never sheds """
+    max_wait: float | None = None
+    """ Seconds an update waits for a slot before it is shed """
+
+
+@dataclass
+class LaneStats:
+    """Counters of one lane."""
+
+    handled: int = 0
+    shed: int = 0
+    waiting: int = 0
+    max_waiting: int = 0
+    wait_seconds: float = 0.0
+    max_wait: float = 0.0
+
+
+class LaneMetrics:
+    """Collects lane queue depths and waits of the process."""
+
+    def __init__(self):
+        self.stats: dict[str, LaneStats] = {}
+
+    def lane(self, name: str) -> LaneStats:
+        """Counters of a lane, created on first use."""
+        if name not in self.stats:
+            self.stats[name] = LaneStats()
+        return self.stats[name]
+
+    def report(self) -> dict:
+        """Statistics collected so far."""
+        return {
+            name: {
+                "handled": stats.handled,
+                "shed": stats.shed,
+                "waiting": stats.waiting,
+                "max_waiting": stats.max_waiting,
+                "average_wait": (
+                    stats.wait_seconds / stats.handled if stats.handled else 0.0
+                ),
+                "max_wait": stats.max_wait,
+            }
+            for name, stats in self.stats.items()
+        }
+
+
+lane_metrics = LaneMetrics()
+
+
+def default_lanes() -> dict[str, Lane]:
+    """Lanes built from the configuration."""
+    return {
+        PAYMENT_LANE: Lane(concurrency=conf.lanes.payment_concurrency),
+        QUERY_LANE: Lane(
+            concurrency=conf.lanes.query_concurrency,
+            max_waiting=conf.lanes.query_waiting,
+            max_wait=conf.lanes.max_wait,
+        ),
+        REPORT_LANE: Lane(
+            concurrency=conf.lanes.report_concurrency,
+            max_waiting=conf.lanes.report_waiting,
+            max_wait=conf.lanes.max_wait,
+        ),
+    }
+
+
+class PriorityMiddleware(BaseMiddleware):
+    """This middleware runs updates under the semaphore of their lane."""
+
+    def __init__(
+        self,
+        lanes: dict[str, Lane] | None = None,
+        default_lane: str = QUERY_LANE,
+        metrics: LaneMetrics = lane_metrics,
+    ):
+        """Initialize middleware.
+
+        :param lanes: Lanes by name, built from the configuration by default
+        :param default_lane: Lane of handlers without the ``lane`` flag
+        :param metrics: Where queue depths and waits are recorded.
+        """
+        self.lanes = lanes or default_lanes()
+        self.default_lane = default_lane
+        self.metrics = metrics
+        self._slots = {
+            name: asyncio.Semaphore(lane.concurrency)
+            for name, lane in self.lanes.items()
+        }
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, dict[str, Any]], Awaitable[Any]],
+        event: Message | CallbackQuery,
+        data: TransferData,
+    ) -> Any:
+        """This method calls every update which has a handler."""
+        if conf.lanes.disabled:
+            return await handler(event, data)
+
+        name = get_flag(data, "lane", default=self.default_lane)
+        lane = self.lanes[name]
+        slots = self._slots[name]
+        stats = self.metrics.lane(name)
+
+        wait = 0.0
+        if not slots.locked():
+            await slots.acquire()
+        elif lane.max_waiting is not None and stats.waiting >= lane.max_waiting:
+            return await self._shed(event, name, stats)
+        else:
+            started = time.monotonic()
+            stats.waiting += 1
+            stats.max_waiting = max(stats.max_waiting, stats.waiting)
+            try:
+                await asyncio.wait_for(slots.acquire(), timeout=lane.max_wait)
+            except asyncio.TimeoutError:
+                return await self._shed(event, name, stats)
+            finally:
+                stats.waiting -= 1
+            wait = time.monotonic() - started
+
+        stats.handled += 1
+        stats.wait_seconds += wait
+        stats.max_wait = max(stats.max_wait, wait)
+        try:
+            return await handler(event, data)
+        finally:
+            slots.release()
+
+    @staticmethod
+    async def _shed(
+        event: Message | CallbackQuery, name: str, stats: LaneStats
+    ) -> None:
+        stats.shed += 1
+        logging.debug("Shedding an update of the %s lane", name)
+        await event.answer(SHED_TEXT)
@@ -0,0 +1,188 @@
+"""Throttling middleware rejects update bursts before they reach the database.
+
+Every user has a token bucket shared by all handlers. Routers and handlers
+may add buckets of their own, handlers with the ``throttle`` flag:
+
+>> @router.message(F.text == "X", flags={"throttle": ThrottleLimit(0.2, 2)})
+
+All buckets of an update are checked and consumed in one Lua call, so
+replicas share them. When Redis fails or answers slowly, buckets kept in the
+process are used for a while instead.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import CallbackQuery, Message
+from redis.asyncio.client import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from src.bot.structures.data_structure import TransferData
+from src.cache import TTLCache
+from src.configuration import conf
+
+THROTTLED_TEXT = "Juda ko'p so'rov yuborildi, biroz kuting."
+
+CONSUME_TOKENS = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local tokens = {}
+local allowed = 1
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local burst = tonumber(ARGV[i * 2])
+    local state = redis.call("HMGET", key, "tokens", "ts")
+    local available = tonumber(state[1]) or burst
+    local elapsed = math.max(0, now - (tonumber(state[2]) or now))
+    tokens[i] = math.min(burst, available + elapsed * rate)
+    if tokens[i] < 1 then
+        allowed = 0
+    end
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local burst = tonumber(ARGV[i * 2])
+    redis.call("HSET", key, "tokens", tokens[i] - allowed, "ts", now)
+    redis.call("PEXPIRE", key, math.ceil(burst / rate * 1000))
+end
+return allowed
+"""
+
+
+@dataclass(frozen=True)
+class ThrottleLimit:
+    """Token bucket refilled by `rate` tokens a second up to `burst`."""
+
+    rate: float
+    burst: int
+
+
+class MemoryTokenBuckets:
+    """Token buckets of this process, used while Redis is unavailable."""
+
+    def __init__(self, maxsize: int = 10_000):
+        self._buckets = TTLCache(ttl=60, maxsize=maxsize)
+
+    def consume(self, buckets: list[tuple[str, ThrottleLimit]]) -> bool:
+        """Take a token of every bucket, or none when one is empty."""
+        now = time.monotonic()
+        tokens = []
+        for key, limit in buckets:
+            available, updated_at = self._buckets.get(key, (limit.burst, now))
+            tokens.append(min(limit.burst, available + (now - updated_at) * limit.rate))
+        allowed = all(available >= 1 for available in tokens)
+        for (key, limit), available in zip(buckets, tokens):
+            self._buckets.set(
+                key,
+                (available - allowed, now),
+                ttl=limit.burst / limit.rate,
+            )
+        return allowed
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """This middleware drops updates of users exceeding their limits."""
+
+    def __init__(
+        self,
+        user_limit: ThrottleLimit = ThrottleLimit(
+            rate=conf.throttling.user_rate, burst=conf.throttling.user_burst
+        ),
+        router_limits: dict[str, ThrottleLimit] | None = None,
+        redis_timeout: float = conf.throttling.redis_timeout,
+        fallback_for: float = 5,
+    ):
+        """Initialize middleware.
+
+        :param user_limit: Bucket of every user shared by all handlers
+        :param router_limits: Buckets of routers by router name
+        :param redis_timeout: Seconds to wait for Redis before falling back
+        :param fallback_for: Seconds buckets stay in memory after a failure.
+        """
+        self.user_limit = user_limit
+        self.router_limits = router_limits or {}
+        self.redis_timeout = redis_timeout
+        self.fallback_for = fallback_for
+        self.memory_buckets = MemoryTokenBuckets()
+        self._fallback_until = 0.0
+        self._script: AsyncScript | None = None
+        self._warned = TTLCache(ttl=10)
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, dict[str, Any]], Awaitable[Any]],
+        event: Message | CallbackQuery,
+        data: TransferData,
+    ) -> Any:
+        """This method calls every update which has a handler."""
+        if conf.throttling.disabled or event.from_user is None:
+            return await handler(event, data)
+
+        buckets = self._buckets(event.from_user.id, data)
+        if await self._consume(data.get("cache"), buckets):
+            return await handler(event, data)
+        await self._reject(event, buckets[-1][0])
+
+    def _buckets(
+        self, user_id: int, data: dict[str, Any]
+    ) -> list[tuple[str, ThrottleLimit]]:
+        """Buckets of the update, the most specific one last."""
+        buckets = [(f"throttle:{user_id}", self.user_limit)]
+        router = data.get("event_router")
+        if router is not None and router.name in self.router_limits:
+            buckets.append(
+                (f"throttle:{user_id}:{router.name}", self.router_limits[router.name])
+            )
+        limit = get_flag(data, "throttle")
+        if limit is not None:
+            callback = data["handler"].callback
+            handler_key = (
+                f"{callback.__module__}.{callback.__qualname__}"
+                f":{callback.__code__.co_firstlineno}"
+            )
+            buckets.append((f"throttle:{user_id}:{handler_key}", limit))
+        return buckets
+
+    async def _consume(self, cache, buckets: list[tuple[str, ThrottleLimit]]) -> bool:
+        if cache is None or time.monotonic() < self._fallback_until:
+            return self.memory_buckets.consume(buckets)
+
+        script = self._consume_script(cache.redis_client)
+        args = []
+        for _, limit in buckets:
+            args += [limit.rate, limit.burst]
+        try:
+            return bool(
+                await asyncio.wait_for(
+                    script(keys=[key for key, _ in buckets], args=args),
+                    timeout=self.redis_timeout,
+                )
+            )
+        except (asyncio.TimeoutError, RedisError) as e:
+            logging.warning(
+                "Throttling falls back to memory for %ss: %r", self.fallback_for, e
+            )
+            self._fallback_until = time.monotonic() + self.fallback_for
+            return self.memory_buckets.consume(buckets)
+
+    def _consume_script(self, redis: Redis) -> AsyncScript:
+        """Script called by its SHA, loaded again by redis-py when missing."""
+        if self._script is None or self._script.registered_client is not redis:
+            self._script = redis.register_script(CONSUME_TOKENS)
+        return self._script
+
+    async def _reject(self, event: Message | CallbackQuery, bucket: str) -> None:
+        """Tell the user once per bucket and cool down period."""
+        if isinstance(event, CallbackQuery):
+            await event.answer(THROTTLED_TEXT)
+            return
+        if self._warned.get(bucket) is None:
+            self._warned.set(bucket, True)
+            await event.answer(THROTTLED_TEXT)
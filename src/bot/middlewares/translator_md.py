@@ -1,18 +1,33 @@
 from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Any
 
 from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message
 
 from src.bot.structures.data_structure import TransferData
-from src.cache import Cache
+from src.cache import Cache, TTLCache
 from src.configuration import conf
 from src.language.enums import LocaleIdentificationMode
 from src.language.translator import LocaleScheme, Translator
 
 
 class TranslatorMiddleware(BaseMiddleware):
-    """This middleware throw a localized translator to handler."""
+    """This middleware throw a localized translator to handler.
+
+    Locales read from the cache are kept in the process for a while, so most
+    updates make no Redis call at all.
+    """
+
+    def __init__(
+        self, locale_ttl: float = conf.translate.locale_ttl, maxsize: int = 10_000
+    ):
+        """Initialize middleware.
+
+        :param locale_ttl: Seconds a user locale is kept in the process
+        :param maxsize: Users whose locale is kept at once.
+        """
+        self._locales = TTLCache(ttl=locale_ttl, maxsize=maxsize)
 
     async def __call__(
         self,
@@ -32,15 +47,18 @@ class TranslatorMiddleware(BaseMiddleware):
             conf.translate.locale_identify_mode == LocaleIdentificationMode.BY_DATABASE
         ):
             """Get locale from cache"""
-            cache: Cache = data["cache"]
-            locale_key = LocaleScheme(user_id=event.from_user.id)
-            # Use default locale
-            locale = conf.translate.default_locale
-            if await cache.exists(locale_key):
-                # If any locale key were set then use it
-                locale = await cache.get(locale_key)
-            data["translator"] = translator(
-                language=locale.decode() if isinstance(locale, bytes) else locale
+            locale = await self._locales.get_or_load(
+                event.from_user.id,
+                partial(self._load_locale, data["cache"], event.from_user.id),
             )
+            data["translator"] = translator(language=locale)
 
             return await handler(event, data)
+
+    @staticmethod
+    async def _load_locale(cache: Cache, user_id: int) -> str:
+        """Locale of the user in one GET, the default one if it was not set."""
+        locale = await cache.get(LocaleScheme(user_id=user_id))
+        if locale is None:
+            return conf.translate.default_locale
+        return locale.decode() if isinstance(locale, bytes) else locale
@@ -0,0 +1,154 @@
+"""Worker which renders queued reports and sends them to the requesting chat.
+
+Jobs live in the reports table. Workers claim them with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so several workers, in one or many bot
+processes, never render the same job twice.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from datetime import datetime
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import BufferedInputFile
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.cache import Cache, ReportCache
+from src.configuration import conf
+from src.db.models.report import Report
+from src.errors.custom import RenderQueueFullError
+from src.schemas.report import ReportFile
+from src.services.establishment import EstablishmentService
+from src.services.report_queue import ReportQueue
+
+REPORT_CAPTIONS = {"pdf": "Hisobot PDF fayli", "xlsx": "Hisobot EXCEL fayli"}
+REPORT_FAILED_TEXT = "Hisobotni tayyorlab bo'lmadi, qayta urinib ko'ring."
+
+
+async def render_detailed_report(session: AsyncSession, job: Report) -> ReportFile:
+    """Render a detailed establishment report of a job."""
+    return await EstablishmentService(session).get_detailed_report(
+        job.parameters["establishment_id"],
+        datetime.fromisoformat(job.parameters["start_date"]),
+        datetime.fromisoformat(job.parameters["end_date"]),
+        job.format,
+    )
+
+
+REPORT_RENDERERS: dict[
+    str, Callable[[AsyncSession, Report], Awaitable[ReportFile]]
+] = {
+    "detailed": render_detailed_report,
+}
+
+
+class ReportWorker:
+    """Processes queued report jobs in background tasks."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        engine: AsyncEngine,
+        cache: Cache,
+        workers: int = conf.reports.job_workers,
+        poll_interval: float = conf.reports.job_poll_interval,
+        housekeeping_interval: float = 60,
+    ):
+        """Initialize worker, tasks are started with start().
+
+        :param workers: Jobs processed at once
+        :param poll_interval: Seconds to wait when the queue is empty
+        :param housekeeping_interval: Seconds between purges of expired reports.
+        """
+        self.bot = bot
+        self.engine = engine
+        self.cache = cache
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.housekeeping_interval = housekeeping_interval
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start processing jobs."""
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._housekeep()))
+
+    async def stop(self) -> None:
+        """Stop processing, interrupted jobs are requeued later."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def process_next(self) -> bool:
+        """Render and deliver one job.
+
+        :return: False when there was nothing to process.
+        """
+        async with AsyncSession(bind=self.engine) as session:
+            queue = ReportQueue(session)
+            job = await queue.claim()
+            if job is None:
+                return False
+
+            try:
+                report = await REPORT_RENDERERS[job.type](session, job)
+                await self._deliver(job, report)
+            except RenderQueueFullError:
+                await queue.retry(job)
+                return False
+            except Exception as error:
+                logging.exception("Report job %s failed", job.id)
+                await session.rollback()
+                await queue.fail(job, repr(error))
+                with suppress(TelegramAPIError):
+                    await self.bot.send_message(job.chat_id, REPORT_FAILED_TEXT)
+                return True
+
+            await queue.complete(job, report)
+            return True
+
+    async def _deliver(self, job: Report, report: ReportFile) -> None:
+        """Send the report and cache it for identical requests."""
+        report_cache = ReportCache(self.cache)
+        key = await report_cache.key(
+            job.parameters["establishment_id"],
+            period=job.parameters["period"],
+            report_format=job.format,
+        )
+        await report_cache.put(key, report)
+
+        sent = await self.bot.send_document(
+            job.chat_id,
+            BufferedInputFile(report.content, filename=report.filename),
+            caption=REPORT_CAPTIONS[job.format],
+        )
+        await report_cache.remember_file_id(key, sent.document.file_id)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.process_next()
+            except Exception:
+                logging.exception("Report worker iteration failed")
+                processed = False
+            if not processed:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _housekeep(self) -> None:
+        while True:
+            try:
+                async with AsyncSession(bind=self.engine) as session:
+                    requeued, purged = await ReportQueue(session).housekeep()
+                if requeued or purged:
+                    logging.info(
+                        "Requeued %s stale report jobs, purged %s reports",
+                        requeued,
+                        purged,
+                    )
+            except Exception:
+                logging.exception("Report housekeeping failed")
+            await asyncio.sleep(self.housekeeping_interval)
@@ -0,0 +1,95 @@
+"""This file contains wiring of the bot shared by every startup mode."""
+
+import logging
+from typing import Any, NamedTuple
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.default import DefaultBotProperties
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.bot.digest import DigestScheduler
+from src.bot.dispatcher import (
+    get_dispatcher,
+    get_event_isolation,
+    get_redis_storage,
+)
+from src.bot.isolation import lock_metrics
+from src.bot.middlewares.priority_md import lane_metrics
+from src.bot.report_worker import ReportWorker
+from src.bot.structures.data_structure import TransferData
+from src.cache import Cache
+from src.cache.adapter import build_redis_client
+from src.configuration import conf
+from src.db.database import create_async_engine
+from src.db.statements import statement_registry
+from src.language.translator import Translator
+from src.utils.render_pool import report_renderer
+
+
+class BotApp(NamedTuple):
+    """Bot, its dispatcher and the workflow data passed to handlers."""
+
+    bot: Bot
+    dispatcher: Dispatcher
+    data: dict[str, Any]
+
+
+async def log_statement_stats():
+    """Log compiled statement cache usage when the bot stops."""
+    logging.info(
+        "Statement cache hit ratio %.2f: %s",
+        statement_registry.hit_ratio(),
+        statement_registry.report(),
+    )
+
+
+async def log_lock_stats():
+    """Log chat lock contention when the bot stops."""
+    logging.info("Chat lock statistics: %s", lock_metrics.report())
+
+
+async def log_lane_stats():
+    """Log priority lane queue depths and waits when the bot stops."""
+    logging.info("Priority lane statistics: %s", lane_metrics.report())
+
+
+def create_bot() -> Bot:
+    """Create bot with default properties."""
+    return Bot(token=conf.bot.token, default=DefaultBotProperties(parse_mode="html"))
+
+
+async def setup_bot() -> BotApp:
+    """Create bot, dispatcher, connections and background jobs.
+
+    Must be called inside the event loop the bot runs in.
+    """
+    bot = create_bot()
+    # One connection pool for the cache, FSM storage and chat locks
+    redis = build_redis_client()
+    cache = Cache(redis)
+    storage = get_redis_storage(redis=redis)
+    engine = create_async_engine(url=conf.db.build_connection_str())
+    report_worker = ReportWorker(bot=bot, engine=engine, cache=cache)
+    dp = get_dispatcher(
+        storage=storage, event_isolation=get_event_isolation(redis=redis)
+    )
+    dp.startup.register(report_worker.start)
+    dp.shutdown.register(report_worker.stop)
+    if not conf.digest.disabled:
+        digest_scheduler = DigestScheduler(bot=bot, engine=engine, cache=cache)
+        dp.startup.register(digest_scheduler.start)
+        dp.shutdown.register(digest_scheduler.stop)
+    dp.shutdown.register(log_statement_stats)
+    dp.shutdown.register(log_lock_stats)
+    dp.shutdown.register(log_lane_stats)
+    dp.shutdown.register(report_renderer.shutdown)
+
+    data = {
+        **TransferData(
+            engine=engine,
+            session_factory=async_sessionmaker(engine),
+            cache=cache,
+        ),
+        "translator": Translator(),
+    }
+    return BotApp(bot=bot, dispatcher=dp, data=data)
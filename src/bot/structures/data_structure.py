@@ -7,9 +7,10 @@ transfer throw Dispatcher->Middlewares->Handlers.
 from typing import TypedDict
 
 from aiogram import Bot
-from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from src.bot.structures.role import Role
+from src.cache import Cache
 from src.language.enums import Locales
 from src.language.translator import LocalizedTranslator, Translator
 from src.services.tg_bot_service import TelegramBotService
@@ -20,6 +21,8 @@ class TransferData(TypedDict):
 
     translator: Translator | LocalizedTranslator
     engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    cache: Cache
     db: TelegramBotService
     bot: Bot
     role: Role
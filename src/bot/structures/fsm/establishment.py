@@ -8,3 +8,5 @@ class ProcessEstablishment(StatesGroup):
     select_type = State()
     send_date_filter = State()
     send_id_filter = State()
+    send_report_period = State()
+    select_report_format = State()
@@ -30,6 +30,7 @@ def establishment_menu():
     builder.button(text="Tranzaksiyalar")
     builder.button(text="Umumiy daromad")
     builder.button(text="Hisobotni olish PDF/Excel")
+    builder.button(text="Batafsil hisobot")
     builder.adjust(1)
 
     return builder.as_markup(resize_keyboard=True)
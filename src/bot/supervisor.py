@@ -0,0 +1,285 @@
+"""Multi-process mode of the bot.
+
+The main process only receives updates, by polling or webhook, and shards
+them by chat id to worker processes. Every worker has its own event loop,
+engine, Redis pool and dispatcher, built like a single process bot. Updates
+of one chat always reach the same worker, which handles them one after
+another, so per chat ordering is kept while chats are spread across cores.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import secrets
+import signal
+from contextlib import suppress
+from functools import partial
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from queue import Full
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.methods import GetUpdates, TelegramMethod
+from aiohttp import web
+
+from src.bot.dispatcher import get_dispatcher
+from src.bot.setup import create_bot, setup_bot
+from src.bot.webhook import serve_webhook
+from src.configuration import conf
+
+
+def shard_key(update: dict[str, Any]) -> int:
+    """Chat id of a raw update, the sender or update id when it has no chat."""
+    for name, event in update.items():
+        if name == "update_id" or not isinstance(event, dict):
+            continue
+        chat = event.get("chat") or (event.get("message") or {}).get("chat")
+        if chat:
+            return chat["id"]
+        user = event.get("from") or event.get("user")
+        if user:
+            return user["id"]
+    return update.get("update_id", 0)
+
+
+class OrderedFeeder:
+    """Feeds updates to a dispatcher, one at a time per chat."""
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        concurrency: int = conf.bot.update_concurrency,
+        chat_pending_limit: int = conf.bot.chat_pending_limit,
+        **data: Any,
+    ):
+        """Initialize feeder.
+
+        :param concurrency: Updates handled at once
+        :param chat_pending_limit: Updates of one chat scheduled at once, later
+        ones are dropped
+        :param data: Workflow data passed to handlers.
+        """
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self.data = data
+        self.chat_pending_limit = chat_pending_limit
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tails: dict[int, asyncio.Task] = {}
+        self._pending: dict[int, int] = {}
+
+    async def feed(self, update: dict[str, Any]) -> None:
+        """Schedule an update after the previous one of its chat.
+
+        Never waits, so a chat sending a burst does not hold up the others.
+        """
+        key = shard_key(update)
+        pending = self._pending.get(key, 0)
+        if pending >= self.chat_pending_limit:
+            logging.warning(
+                "Dropping update %s, chat %s has %s updates pending",
+                update.get("update_id"),
+                key,
+                pending,
+            )
+            return
+
+        self._pending[key] = pending + 1
+        task = asyncio.create_task(self._handle(update, self._tails.get(key)))
+        self._tails[key] = task
+        task.add_done_callback(partial(self._done, key))
+
+    async def drain(self) -> None:
+        """Wait for every scheduled update."""
+        await asyncio.gather(*self._tails.values(), return_exceptions=True)
+
+    async def _handle(
+        self, update: dict[str, Any], previous: asyncio.Task | None
+    ) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        # Only updates whose chat is free take a slot
+        async with self._slots:
+            try:
+                result = await self.dispatcher.feed_raw_update(
+                    self.bot, update, **self.data
+                )
+                if isinstance(result, TelegramMethod):
+                    await self.dispatcher.silent_call_request(self.bot, result)
+            except Exception:
+                logging.exception("Update %s failed", update.get("update_id"))
+
+    def _done(self, key: int, task: asyncio.Task) -> None:
+        if self._pending[key] > 1:
+            self._pending[key] -= 1
+        else:
+            del self._pending[key]
+        if self._tails.get(key) is task:
+            del self._tails[key]
+
+
+def run_worker(index: int, updates: Queue) -> None:
+    """Entry point of a worker process.
+
+    Interrupts are left to the supervisor, which stops workers with a None
+    sentinel once the ingress stopped.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(
+        level=conf.logging_level, format=f"[worker {index}] %(levelname)s %(message)s"
+    )
+    asyncio.run(serve_shard(updates))
+
+
+async def serve_shard(updates: Queue) -> None:
+    """Handle updates of the queue until the None sentinel."""
+    bot, dp, data = await setup_bot()
+    workflow_data = {
+        "dispatcher": dp,
+        "bots": [bot],
+        "bot": bot,
+        **dp.workflow_data,
+        **data,
+    }
+    await dp.emit_startup(**workflow_data)
+    feeder = OrderedFeeder(dp, bot, **data)
+    try:
+        while (update := await asyncio.to_thread(updates.get)) is not None:
+            await feeder.feed(update)
+        await feeder.drain()
+    finally:
+        await dp.emit_shutdown(**workflow_data)
+        await bot.session.close()
+
+
+class Supervisor:
+    """Runs the update ingress and keeps worker processes alive."""
+
+    def __init__(
+        self,
+        workers: int = conf.bot.workers,
+        queue_size: int = conf.bot.shard_queue_size,
+        stop_timeout: float = 30,
+    ):
+        """Initialize supervisor, processes are started by run().
+
+        :param workers: Worker processes
+        :param queue_size: Updates waiting for a worker before ingress blocks
+        :param stop_timeout: Seconds workers get to finish on shutdown.
+        """
+        self._context = multiprocessing.get_context("spawn")
+        self._queues: list[Queue] = [
+            self._context.Queue(queue_size) for _ in range(workers)
+        ]
+        self._put_locks = [asyncio.Lock() for _ in range(workers)]
+        self._processes: list[BaseProcess | None] = [None] * workers
+        self.stop_timeout = stop_timeout
+
+    async def run(self) -> None:
+        """Start workers and receive updates until cancelled or terminated."""
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, asyncio.current_task().cancel
+        )
+        for index in range(len(self._queues)):
+            self._start_worker(index)
+        monitor = asyncio.create_task(self._monitor())
+
+        bot = create_bot()
+        allowed_updates = get_dispatcher().resolve_used_update_types()
+        try:
+            if conf.bot.mode == "webhook":
+                await serve_webhook(self._webhook_app(), bot, allowed_updates)
+            else:
+                await bot.delete_webhook()
+                await self._poll(bot, allowed_updates)
+        finally:
+            monitor.cancel()
+            await self._stop_workers()
+            await bot.session.close()
+
+    async def forward(self, update: dict[str, Any]) -> None:
+        """Queue an update for the worker of its chat.
+
+        Puts into one queue are serialized, so a full queue does not let
+        later updates of a chat overtake earlier ones.
+        """
+        index = shard_key(update) % len(self._queues)
+        async with self._put_locks[index]:
+            try:
+                self._queues[index].put_nowait(update)
+            except Full:
+                await asyncio.to_thread(self._queues[index].put, update)
+
+    async def _poll(
+        self, bot: Bot, allowed_updates: list[str], polling_timeout: int = 10
+    ) -> None:
+        offset = None
+        backoff = 1
+        while True:
+            try:
+                updates = await bot(
+                    GetUpdates(
+                        offset=offset,
+                        timeout=polling_timeout,
+                        allowed_updates=allowed_updates,
+                    ),
+                    request_timeout=int(bot.session.timeout + polling_timeout),
+                )
+            except Exception:
+                logging.exception("Failed to fetch updates, retrying in %ss", backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+
+            backoff = 1
+            for update in updates:
+                await self.forward(update.model_dump(mode="json", exclude_unset=True))
+                offset = update.update_id + 1
+
+    def _webhook_app(self) -> web.Application:
+        if not conf.bot.webhook_secret:
+            raise RuntimeError("BOT_WEBHOOK_SECRET is required in webhook mode")
+
+        async def handle(request: web.Request) -> web.Response:
+            secret = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+            if not secrets.compare_digest(secret, conf.bot.webhook_secret):
+                return web.Response(body="Unauthorized", status=401)
+            await self.forward(await request.json())
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_post(conf.bot.webhook_path, handle)
+        return app
+
+    def _start_worker(self, index: int) -> None:
+        process = self._context.Process(
+            target=run_worker,
+            args=(index, self._queues[index]),
+            name=f"bot-worker-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+        logging.info("Started worker %s, pid %s", index, process.pid)
+
+    async def _monitor(self, interval: float = 1) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            for index, process in enumerate(self._processes):
+                if not process.is_alive():
+                    logging.error(
+                        "Worker %s exited with %s, restarting",
+                        index,
+                        process.exitcode,
+                    )
+                    self._start_worker(index)
+
+    async def _stop_workers(self) -> None:
+        for queue in self._queues:
+            with suppress(Full):
+                await asyncio.to_thread(queue.put, None, timeout=self.stop_timeout)
+        for index, process in enumerate(self._processes):
+            await asyncio.to_thread(process.join, self.stop_timeout)
+            if process.is_alive():
+                logging.warning("Worker %s did not stop in time, terminating", index)
+                process.terminate()
@@ -0,0 +1,157 @@
+"""Webhook ingress of the bot.
+
+Telegram posts updates to an aiohttp server which answers at once and feeds
+them to the same dispatcher polling uses. The number of updates handled at
+once is bounded, further requests wait for a free slot, so Telegram slows
+down instead of the process piling up tasks. Every webhook process is
+stateless, several of them can run behind a load balancer.
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from src.configuration import conf
+
+
+class LimitedRequestHandler(SimpleRequestHandler):
+    """Request handler feeding at most `concurrency` updates at once."""
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        secret_token: str | None = None,
+        concurrency: int = conf.bot.update_concurrency,
+        shutdown_timeout: float = 30,
+        **data: Any,
+    ):
+        """Initialize handler.
+
+        :param secret_token: Expected X-Telegram-Bot-Api-Secret-Token header
+        :param concurrency: Updates handled at once
+        :param shutdown_timeout: Seconds to finish handled updates on shutdown
+        :param data: Workflow data passed to handlers.
+        """
+        super().__init__(
+            dispatcher=dispatcher,
+            bot=bot,
+            handle_in_background=True,
+            secret_token=secret_token,
+            **data,
+        )
+        self.shutdown_timeout = shutdown_timeout
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def _handle_request_background(
+        self, bot: Bot, request: web.Request
+    ) -> web.Response:
+        await self._slots.acquire()
+        try:
+            update = await request.json(loads=bot.session.json_loads)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        task = asyncio.create_task(self._background_feed_update(bot=bot, update=update))
+        self._background_feed_update_tasks.add(task)
+        task.add_done_callback(self._background_feed_update_tasks.discard)
+        task.add_done_callback(lambda _: self._slots.release())
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    async def close(self) -> None:
+        """Wait for handled updates, then close the bot session."""
+        if self._background_feed_update_tasks:
+            _, pending = await asyncio.wait(
+                self._background_feed_update_tasks, timeout=self.shutdown_timeout
+            )
+            if pending:
+                logging.warning("Cancelling %s unfinished updates", len(pending))
+                for task in pending:
+                    task.cancel()
+        await super().close()
+
+
+def build_webhook_app(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    path: str = conf.bot.webhook_path,
+    secret_token: str | None = conf.bot.webhook_secret,
+    concurrency: int = conf.bot.update_concurrency,
+    **data: Any,
+) -> web.Application:
+    """Build the aiohttp application receiving updates.
+
+    Dispatcher startup and shutdown run with the application.
+
+    :param path: Path updates are posted to
+    :param secret_token: Required, updates without it are rejected
+    :param data: Workflow data passed to handlers.
+    """
+    if not secret_token:
+        raise RuntimeError("BOT_WEBHOOK_SECRET is required in webhook mode")
+
+    app = web.Application()
+    LimitedRequestHandler(
+        dispatcher=dispatcher,
+        bot=bot,
+        secret_token=secret_token,
+        concurrency=concurrency,
+        **data,
+    ).register(app, path=path)
+    setup_application(app, dispatcher, bot=bot, **data)
+    return app
+
+
+async def run_webhook(dispatcher: Dispatcher, bot: Bot, **data: Any) -> None:
+    """Serve the webhook until cancelled.
+
+    :param data: Workflow data passed to handlers.
+    """
+    await serve_webhook(
+        build_webhook_app(dispatcher, bot, **data),
+        bot,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+    )
+
+
+async def serve_webhook(
+    app: web.Application, bot: Bot, allowed_updates: list[str]
+) -> None:
+    """Run a webhook application until cancelled.
+
+    The webhook is registered with Telegram once the server listens. It is
+    left in place on shutdown, other replicas may still serve it.
+
+    :param allowed_updates: Update types Telegram should send
+    """
+    if not conf.bot.webhook_url:
+        raise RuntimeError("BOT_WEBHOOK_URL is required in webhook mode")
+    if not conf.bot.webhook_secret:
+        raise RuntimeError("BOT_WEBHOOK_SECRET is required in webhook mode")
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        await web.TCPSite(
+            runner, host=conf.bot.webhook_host, port=conf.bot.webhook_port
+        ).start()
+        await bot.set_webhook(
+            url=conf.bot.webhook_url,
+            secret_token=conf.bot.webhook_secret,
+            max_connections=conf.bot.webhook_max_connections,
+            allowed_updates=allowed_updates,
+        )
+        logging.info(
+            "Serving webhook on %s:%s%s",
+            conf.bot.webhook_host,
+            conf.bot.webhook_port,
+            conf.bot.webhook_path,
+        )
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
@@ -1 +1,5 @@
 from .adapter import Cache  # noqa: F401
+from .dashboard import DashboardCache  # noqa: F401
+from .memory import TTLCache  # noqa: F401
+from .reports import ReportCache  # noqa: F401
+from .summary import SummaryCache  # noqa: F401
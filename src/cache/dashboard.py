@@ -0,0 +1,128 @@
+"""This file contains the stale-while-revalidate cache of dashboard snapshots."""
+
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any, NamedTuple
+from uuid import uuid4
+
+from src.cache.adapter import Cache
+from src.cache.shared import RELEASE_LOCK, compute_once
+from src.configuration import conf
+
+SNAPSHOT_KEY = "dashboard:snapshot"
+LOCK_KEY = "dashboard:snapshot:lock"
+
+
+class Snapshot(NamedTuple):
+    """Dashboard statistics with the moment they were computed at."""
+
+    data: dict[str, Any]
+    computed_at: datetime
+
+
+class DashboardCache:
+    """Keeps the latest dashboard snapshot in Redis.
+
+    Fresh snapshots are served as is. Stale ones are served immediately while
+    a single background refresh, guarded by a Redis lock shared by every admin
+    process, recomputes them. A missing snapshot is computed in the request
+    holding the same lock, other requests wait for it.
+    """
+
+    def __init__(
+        self,
+        cache: Cache,
+        fresh_for: int = conf.admin.dashboard_fresh_for,
+        ttl: int = conf.admin.dashboard_snapshot_ttl,
+        lock_ttl: int = 60,
+        wait: float = 30,
+    ):
+        """Initialize cache.
+
+        :param fresh_for: Seconds a snapshot is served without a refresh
+        :param ttl: Seconds a stale snapshot is still served
+        :param lock_ttl: Seconds a refresh may take before another one starts
+        :param wait: Seconds a request waits for a missing snapshot computed
+        by another one.
+        """
+        self.cache = cache
+        self.fresh_for = fresh_for
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait = wait
+        self._refreshes: set[asyncio.Task] = set()
+
+    async def get(self, compute: Callable[[], Awaitable[dict[str, Any]]]) -> Snapshot:
+        """Get the snapshot, refreshing it when needed.
+
+        :param compute: Coroutine function computing the statistics
+        """
+        snapshot = await self._load()
+        if snapshot is None:
+            return await self._compute_missing(compute)
+
+        age = (datetime.now() - snapshot.computed_at).total_seconds()
+        if age > self.fresh_for:
+            await self._refresh_in_background(compute)
+        return snapshot
+
+    async def _compute_missing(
+        self, compute: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> Snapshot:
+        async def compute_and_store() -> Snapshot:
+            return await self._store(await compute())
+
+        return await compute_once(
+            self.cache,
+            LOCK_KEY,
+            load=self._load,
+            compute=compute_and_store,
+            lock_ttl=self.lock_ttl,
+            wait=self.wait,
+        )
+
+    async def _load(self) -> Snapshot | None:
+        raw = await self.cache.get(SNAPSHOT_KEY)
+        if raw is None:
+            return None
+        payload = json.loads(raw)
+        return Snapshot(
+            data=payload["data"],
+            computed_at=datetime.fromisoformat(payload["computed_at"]),
+        )
+
+    async def _store(self, data: dict[str, Any]) -> Snapshot:
+        snapshot = Snapshot(data=data, computed_at=datetime.now())
+        await self.cache.redis_client.set(
+            SNAPSHOT_KEY,
+            json.dumps({"data": data, "computed_at": snapshot.computed_at.isoformat()}),
+            ex=self.ttl,
+        )
+        return snapshot
+
+    async def _refresh_in_background(
+        self, compute: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> None:
+        token = uuid4().hex
+        acquired = await self.cache.redis_client.set(
+            LOCK_KEY, token, nx=True, ex=self.lock_ttl
+        )
+        if not acquired:
+            return
+
+        task = asyncio.create_task(self._refresh(compute, token))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _refresh(
+        self, compute: Callable[[], Awaitable[dict[str, Any]]], token: str
+    ) -> None:
+        try:
+            await self._store(await compute())
+        except Exception:
+            logging.exception("Dashboard snapshot refresh failed")
+        finally:
+            await self.cache.redis_client.eval(RELEASE_LOCK, 1, LOCK_KEY, token)
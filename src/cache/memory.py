@@ -0,0 +1,128 @@
+"""This file contains an in-process TTL cache with single-flight loading."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class _LoadCancelled(Exception):
+    """The caller running a shared load was cancelled before it finished."""
+
+
+class TTLCache:
+    """Small in-process cache which forgets entries after ``ttl`` seconds.
+
+    Concurrent misses of the same key share one loader call instead of
+    running it once per caller.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        """Initialize the cache.
+
+        :param ttl: Default lifetime of an entry in seconds
+        :param maxsize: Maximum number of entries kept at once.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value if it is still fresh
+        :param key: Key to look up
+        :param default: Value returned on a miss
+        :return: Cached value or default.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Put a value into the cache
+        :param key: Key to set
+        :param value: Any value
+        :param ttl: (Optional) Lifetime overriding the default one
+        :return: Nothing.
+        """
+        if key not in self._data and len(self._data) >= self.maxsize:
+            self._evict()
+        self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop a key from the cache."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+        ttl: float | None = None,
+    ) -> T:
+        """Get a value or compute it once for all concurrent callers.
+
+        When the caller running the loader is cancelled, the others are not,
+        one of them runs the loader instead.
+
+        :param key: Key to look up
+        :param loader: Coroutine factory called on a miss
+        :param ttl: (Optional) Lifetime overriding the default one
+        :return: Cached or freshly loaded value.
+        """
+        while True:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                return await asyncio.shield(inflight)
+            except _LoadCancelled:
+                # The caller which loaded was cancelled, load again instead
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.set_exception(_LoadCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _evict(self) -> None:
+        """Drop expired entries, or the oldest one if none has expired."""
+        now = time.monotonic()
+        expired = [
+            key for key, (expires_at, _) in self._data.items() if expires_at <= now
+        ]
+        for key in expired:
+            del self._data[key]
+        if not expired and self._data:
+            del self._data[next(iter(self._data))]
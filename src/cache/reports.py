@@ -0,0 +1,96 @@
+"""This file contains the cache of rendered reports."""
+
+from typing import NamedTuple
+
+from src.cache.adapter import Cache
+from src.configuration import conf
+from src.schemas.report import ReportFile
+
+
+class ReportKey(NamedTuple):
+    """Report key which addresses one rendering of a report."""
+
+    establishment_id: int
+    period: str
+    format: str
+    version: int
+
+    def __str__(self):
+        return (
+            f"report:{self.establishment_id}:{self.period}:"
+            f"{self.format}:v{self.version}"
+        )
+
+
+class CachedReport(NamedTuple):
+    """Report restored from the cache."""
+
+    file: ReportFile
+    file_id: str | None
+
+
+class ReportCache:
+    """Keeps rendered reports and the Telegram file_id of their first upload.
+
+    Every establishment has a data version which is a part of report keys.
+    Services writing transactions and the admin deleting them bump the
+    version, which makes old entries unreachable, and they expire on their
+    own.
+    """
+
+    def __init__(self, cache: Cache, ttl: int = conf.reports.cache_ttl):
+        self.cache = cache
+        self.ttl = ttl
+
+    @staticmethod
+    def _version_key(establishment_id: int) -> str:
+        return f"report:{establishment_id}:version"
+
+    async def key(
+        self, establishment_id: int, period: str, report_format: str
+    ) -> ReportKey:
+        """Build a key for the current data version of the establishment."""
+        version = await self.cache.get(self._version_key(establishment_id))
+        return ReportKey(
+            establishment_id=establishment_id,
+            period=period,
+            format=report_format,
+            version=int(version or 0),
+        )
+
+    async def get(self, key: ReportKey) -> CachedReport | None:
+        """Get a cached report
+        :param key: Report key
+        :return: Cached report or None.
+        """
+        entry = await self.cache.redis_client.hgetall(str(key))
+        if not entry or b"content" not in entry:
+            return None
+        file_id = entry.get(b"file_id")
+        return CachedReport(
+            file=ReportFile(
+                filename=entry[b"filename"].decode(), content=entry[b"content"]
+            ),
+            file_id=file_id.decode() if file_id else None,
+        )
+
+    async def put(self, key: ReportKey, report: ReportFile) -> None:
+        """Save rendered report bytes."""
+        async with self.cache.redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                str(key),
+                mapping={"filename": report.filename, "content": report.content},
+            )
+            pipe.expire(str(key), self.ttl)
+            await pipe.execute()
+
+    async def remember_file_id(self, key: ReportKey, file_id: str) -> None:
+        """Save the Telegram file_id of the uploaded report."""
+        async with self.cache.redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(str(key), "file_id", file_id)
+            pipe.expire(str(key), self.ttl)
+            await pipe.execute()
+
+    async def invalidate(self, establishment_id: int) -> None:
+        """Make every cached report of the establishment stale."""
+        await self.cache.redis_client.incr(self._version_key(establishment_id))
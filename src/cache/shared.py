@@ -0,0 +1,57 @@
+"""Values computed by one caller for every process sharing the Redis server."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+from uuid import uuid4
+
+from src.cache.adapter import Cache
+
+T = TypeVar("T")
+
+RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+async def compute_once(
+    cache: Cache,
+    lock_key: str,
+    load: Callable[[], Awaitable[T | None]],
+    compute: Callable[[], Awaitable[T]],
+    lock_ttl: float,
+    wait: float,
+    poll_interval: float = 0.1,
+) -> T:
+    """Compute a missing value in one caller while the others wait for it.
+
+    The caller taking the lock runs `compute`, which must store the value
+    where `load` finds it. Others poll `load` and compute the value on their
+    own once `wait` seconds passed, so a crashed computation only delays them.
+
+    :param lock_key: Redis key of the lock
+    :param load: Coroutine function returning the stored value or None
+    :param compute: Coroutine function computing and storing the value
+    :param lock_ttl: Seconds the computation may take before the lock expires
+    :param wait: Seconds to wait for another caller's computation
+    :param poll_interval: Seconds between two loads while waiting
+    :return: Computed or loaded value.
+    """
+    token = uuid4().hex
+    if await cache.redis_client.set(lock_key, token, nx=True, px=int(lock_ttl * 1000)):
+        try:
+            return await compute()
+        finally:
+            await cache.redis_client.eval(RELEASE_LOCK, 1, lock_key, token)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while loop.time() < deadline:
+        await asyncio.sleep(poll_interval)
+        value = await load()
+        if value is not None:
+            return value
+    return await compute()
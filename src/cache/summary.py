@@ -0,0 +1,81 @@
+"""This file contains the shared cache of the company summary."""
+
+import json
+from collections.abc import Awaitable, Callable
+from decimal import Decimal
+from typing import Any
+
+from src.cache.adapter import Cache
+from src.cache.shared import compute_once
+from src.configuration import conf
+
+SUMMARY_KEY = "report:company_summary"
+LOCK_KEY = "report:company_summary:lock"
+DECIMAL_FIELDS = ("total_spending", "today_spending", "month_spending")
+
+
+class SummaryCache:
+    """Keeps the company summary in Redis for the bot and the admin.
+
+    A missing summary is computed by a single caller of every process, the
+    others wait for it.
+    """
+
+    def __init__(
+        self,
+        cache: Cache,
+        ttl: float = conf.cache.summary_ttl,
+        lock_ttl: float = 30,
+        wait: float = 5,
+    ):
+        """Initialize cache.
+
+        :param ttl: Seconds the summary is served once computed
+        :param lock_ttl: Seconds a computation may take before another starts
+        :param wait: Seconds to wait for another caller's computation.
+        """
+        self.cache = cache
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait = wait
+
+    async def get(
+        self, compute: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """Get the summary, computing it once when missing.
+
+        :param compute: Coroutine function computing the summary
+        """
+        summary = await self._load()
+        if summary is not None:
+            return summary
+
+        async def compute_and_store() -> dict[str, Any]:
+            return await self._store(await compute())
+
+        return await compute_once(
+            self.cache,
+            LOCK_KEY,
+            load=self._load,
+            compute=compute_and_store,
+            lock_ttl=self.lock_ttl,
+            wait=self.wait,
+        )
+
+    async def _load(self) -> dict[str, Any] | None:
+        raw = await self.cache.get(SUMMARY_KEY)
+        if raw is None:
+            return None
+        summary = json.loads(raw)
+        for field in DECIMAL_FIELDS:
+            if field in summary:
+                summary[field] = Decimal(summary[field])
+        return summary
+
+    async def _store(self, summary: dict[str, Any]) -> dict[str, Any]:
+        await self.cache.redis_client.set(
+            SUMMARY_KEY,
+            json.dumps(summary, default=str),
+            px=int(self.ttl * 1000),
+        )
+        return summary
@@ -22,6 +22,8 @@ class DatabaseConfig:
     passwd: str | None = getenv("POSTGRES_PASSWORD", None)
     port: int = int(getenv("POSTGRES_PORT", 5432))
     host: str = getenv("POSTGRES_HOST", "db")
+    query_cache_size: int = int(getenv("POSTGRES_QUERY_CACHE_SIZE", 500))
+    """ Size of SQLAlchemy compiled statement cache """
 
     driver: str = "asyncpg"
     database_system: str = "postgresql"
@@ -57,6 +59,132 @@ class BotConfig:
     """Bot configuration."""
 
     token: str = getenv("BOT_TOKEN")
+    mode: str = getenv("BOT_MODE", "polling")
+    """ Update delivery, either polling or webhook """
+    webhook_url: str | None = getenv("BOT_WEBHOOK_URL")
+    """ Public HTTPS URL Telegram posts updates to, path included """
+    webhook_path: str = getenv("BOT_WEBHOOK_PATH", "/webhook")
+    """ Path the webhook server listens on, behind the proxy """
+    webhook_secret: str | None = getenv("BOT_WEBHOOK_SECRET")
+    """ Secret token Telegram sends in every webhook request, required there """
+    webhook_host: str = getenv("BOT_WEBHOOK_HOST", "0.0.0.0")
+    webhook_port: int = int(getenv("BOT_WEBHOOK_PORT", 8080))
+    webhook_max_connections: int = int(getenv("BOT_WEBHOOK_MAX_CONNECTIONS", 40))
+    """ Simultaneous webhook connections Telegram may open, 1 to 100 """
+    update_concurrency: int = int(getenv("BOT_UPDATE_CONCURRENCY", 100))
+    """ Updates handled at once by a webhook process, later requests wait """
+    workers: int = int(getenv("BOT_WORKERS", 1))
+    """ Processes handling updates, above 1 the main one only shards them """
+    shard_queue_size: int = int(getenv("BOT_SHARD_QUEUE_SIZE", 1000))
+    """ Updates waiting for a worker process before the ingress blocks """
+    chat_pending_limit: int = int(getenv("BOT_CHAT_PENDING_LIMIT", 100))
+    """ Updates of one chat a worker keeps scheduled, later ones are dropped """
+    event_isolation: str = getenv("BOT_EVENT_ISOLATION", "redis")
+    """ Per chat update lock, redis across replicas or memory within a process """
+    lock_timeout: float = float(getenv("BOT_LOCK_TIMEOUT", 60))
+    """ Seconds a chat lock lives, so a crashed replica does not hold it """
+    lock_wait_timeout: float | None = (
+        float(getenv("BOT_LOCK_WAIT_TIMEOUT"))
+        if getenv("BOT_LOCK_WAIT_TIMEOUT")
+        else None
+    )
+    """ Seconds an update waits for its chat lock, forever when unset """
+
+
+@dataclass
+class ThrottlingConfig:
+    """Per user update rate limits."""
+
+    disabled: bool = bool(getenv("THROTTLING_DISABLED"))
+    user_rate: float = float(getenv("THROTTLE_USER_RATE", 2))
+    """ Updates a second a user may send on average """
+    user_burst: int = int(getenv("THROTTLE_USER_BURST", 10))
+    """ Updates a user may send at once """
+    redis_timeout: float = float(getenv("THROTTLE_REDIS_TIMEOUT", 0.05))
+    """ Seconds to wait for Redis before using in-process buckets """
+
+
+@dataclass
+class LanesConfig:
+    """Updates handled at once per priority lane."""
+
+    disabled: bool = bool(getenv("LANES_DISABLED"))
+    payment_concurrency: int = int(getenv("LANE_PAYMENT_CONCURRENCY", 5))
+    """ Payment updates handled at once, they are never shed """
+    query_concurrency: int = int(getenv("LANE_QUERY_CONCURRENCY", 8))
+    query_waiting: int = int(getenv("LANE_QUERY_WAITING", 200))
+    """ Query updates waiting before new ones are shed """
+    report_concurrency: int = int(getenv("LANE_REPORT_CONCURRENCY", 2))
+    report_waiting: int = int(getenv("LANE_REPORT_WAITING", 10))
+    """ Report and transaction list updates waiting before new ones are shed """
+    max_wait: float = float(getenv("LANE_MAX_WAIT", 10))
+    """ Seconds a query or report update waits for a slot before it is shed """
+
+
+@dataclass
+class CacheConfig:
+    """Cache configuration."""
+
+    summary_ttl: float = float(getenv("CACHE_SUMMARY_TTL", 30))
+    """ Seconds the company summary stays cached in Redis """
+
+
+@dataclass
+class ReportConfig:
+    """Report rendering configuration."""
+
+    render_workers: int = int(getenv("REPORT_RENDER_WORKERS", 2))
+    """ Processes rendering PDF and Excel files """
+    render_queue_size: int = int(getenv("REPORT_RENDER_QUEUE_SIZE", 16))
+    """ Reports allowed to wait or render at once, others are rejected """
+    persist: bool = bool(getenv("REPORT_PERSIST"))
+    """ Keep rendered reports on disk and in the reports table """
+    store_dir: Path = Path(
+        getenv("REPORT_STORE_DIR", Path(__file__).parent.parent / "reports")
+    )
+    retention_hours: int = int(getenv("REPORT_RETENTION_HOURS", 24))
+    """ Hours a persisted report is kept before it is purged """
+    cache_ttl: int = int(getenv("REPORT_CACHE_TTL", 24 * 60 * 60))
+    """ Seconds a rendered report and its Telegram file_id are reused """
+    font_dir: Path = Path(
+        getenv("REPORT_FONT_DIR", "/usr/share/fonts/truetype/dejavu")
+    )
+    """ Directory with DejaVuSans.ttf and DejaVuSans-Bold.ttf for PDF reports """
+    job_workers: int = int(getenv("REPORT_JOB_WORKERS", 2))
+    """ Queued report jobs processed at once by the bot """
+    job_poll_interval: float = float(getenv("REPORT_JOB_POLL_INTERVAL", 2))
+    """ Seconds an idle worker waits before looking for new jobs """
+    job_timeout: int = int(getenv("REPORT_JOB_TIMEOUT", 10 * 60))
+    """ Seconds after which a running job is considered lost and requeued """
+
+
+@dataclass
+class AdminConfig:
+    """Admin panel configuration."""
+
+    dashboard_concurrency: int = int(getenv("ADMIN_DASHBOARD_CONCURRENCY", 4))
+    """ Dashboard queries running at once, each on its own pooled connection """
+    dashboard_fresh_for: int = int(getenv("ADMIN_DASHBOARD_FRESH_FOR", 60))
+    """ Seconds a dashboard snapshot is served before it is recomputed """
+    dashboard_snapshot_ttl: int = int(getenv("ADMIN_DASHBOARD_SNAPSHOT_TTL", 60 * 60))
+    """ Seconds a stale dashboard snapshot may still be served """
+    exact_count_threshold: int = int(getenv("ADMIN_EXACT_COUNT_THRESHOLD", 10_000))
+    """ Rows above which admin list pages show estimated counts """
+    import_chunk_size: int = int(getenv("ADMIN_IMPORT_CHUNK_SIZE", 1000))
+    """ Employees upserted per statement and transaction by imports """
+    timeseries_max_points: int = int(getenv("ADMIN_TIMESERIES_MAX_POINTS", 300))
+    """ Upper bound of buckets in one chart series """
+
+
+@dataclass
+class DigestConfig:
+    """Daily revenue digest configuration."""
+
+    disabled: bool = bool(getenv("DIGEST_DISABLED"))
+    send_at: str = getenv("DIGEST_SEND_AT", "22:00")
+    """ Local closing time, HH:MM, when the digest of the day is sent """
+    rate_limit: int = int(getenv("DIGEST_RATE_LIMIT", 25))
+    """ Messages sent per second, below the Telegram broadcast limit """
 
 
 @dataclass
@@ -65,6 +193,8 @@ class TranslationsConfig:
 
     locale_identify_mode = LocaleIdentificationMode.BY_DATABASE
     default_locale = "uz"
+    locale_ttl: float = float(getenv("LOCALE_CACHE_TTL", 60))
+    """ Seconds a user locale read from Redis is kept in the process """
 
 
 @dataclass
@@ -78,6 +208,12 @@ class Configuration:
     db = DatabaseConfig()
     redis = RedisConfig()
     bot = BotConfig()
+    cache = CacheConfig()
+    throttling = ThrottlingConfig()
+    lanes = LanesConfig()
+    reports = ReportConfig()
+    digest = DigestConfig()
+    admin = AdminConfig()
     translate = TranslationsConfig()
 
     MEDIA_URL = Path(__file__).parent / "media"
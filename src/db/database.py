@@ -5,12 +5,22 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio import create_async_engine as _create_async_engine
 
 from src.configuration import conf
+from src.db.statements import statement_registry
 
 
 def create_async_engine(url: URL | str) -> AsyncEngine:
     """Create async engine with given URL.
 
+    Executions on the engine are reported to the statement registry.
+
     :param url: URL to connect
     :return: AsyncEngine
     """
-    return _create_async_engine(url=url, echo=conf.debug, pool_pre_ping=True)
+    engine = _create_async_engine(
+        url=url,
+        echo=conf.debug,
+        pool_pre_ping=True,
+        query_cache_size=conf.db.query_cache_size,
+    )
+    statement_registry.instrument(engine)
+    return engine
@@ -3,6 +3,7 @@
 from .base import Base
 from .department import Department
 from .establishment import Establishment
+from .report import Report
 from .transaction import Transaction
 from .user import User
 
@@ -12,4 +13,5 @@ __all__ = (
     "Transaction",
     "Establishment",
     "Department",
+    "Report",
 )
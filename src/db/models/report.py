@@ -0,0 +1,75 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.models.base import Base
+
+
+class ReportStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+ACTIVE_REPORT_CONDITION = "status IN ('PENDING', 'RUNNING')"
+""" Predicate of pending and running jobs, matches the dedup index """
+
+
+class Report(Base):
+    __tablename__ = "reports"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    type: Mapped[str] = mapped_column(String(100), nullable=False)
+    format: Mapped[str] = mapped_column(String(10), nullable=False)
+    parameters: Mapped[dict | None] = mapped_column(JSONB)
+    file_path: Mapped[str | None] = mapped_column(String(500))
+    generated_by: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("users.id"), nullable=False
+    )
+    generated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    # Job queue
+    status: Mapped[ReportStatus] = mapped_column(
+        Enum(ReportStatus), default=ReportStatus.PENDING, nullable=False
+    )
+    chat_id: Mapped[int | None] = mapped_column(BigInteger)
+    dedup_key: Mapped[str | None] = mapped_column(String(64))
+    error: Mapped[str | None] = mapped_column(Text)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    # Indexes
+    __table_args__ = (
+        Index("idx_reports_expires_at", "expires_at"),
+        Index(
+            "idx_reports_pending",
+            "id",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        Index(
+            "uq_reports_active_dedup_key",
+            "dedup_key",
+            unique=True,
+            postgresql_where=text(ACTIVE_REPORT_CONDITION),
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<Report(id={self.id}, title='{self.title}', format={self.format}, "
+            f"status={self.status})>"
+        )
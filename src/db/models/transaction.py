@@ -73,6 +73,6 @@ class Transaction(Base):
     __table_args__ = (
         Index("idx_transactions_user_id", "user_id"),
         Index("idx_transactions_establishment_id", "establishment_id"),
-        Index("idx_transactions_created_at", "created_at"),
+        Index("idx_transactions_created_at_id", "created_at", "id"),
         Index("idx_transactions_type_status", "type", "status"),
     )
@@ -66,6 +66,16 @@ class User(Base):
         Index("idx_users_telegram_id", "telegram_id"),
         Index("idx_users_role", "role"),
         Index("idx_users_department", "department_id"),
+        # Trigram indexes serve ILIKE '%term%' admin searches, need pg_trgm
+        *(
+            Index(
+                f"idx_users_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("username", "first_name", "last_name")
+        ),
     )
 
     @property
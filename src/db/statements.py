@@ -0,0 +1,103 @@
+"""Statement registry which tracks SQLAlchemy compiled cache usage.
+
+Hot queries are executed with a ``statement_name`` execution option, and
+every execution on an instrumented engine is counted as a compiled cache
+hit or miss for that name.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+STATEMENT_NAME_OPTION = "statement_name"
+UNNAMED_STATEMENT = "<unnamed>"
+
+
+@dataclass
+class StatementStats:
+    """Compiled cache counters of one statement."""
+
+    hits: int = 0
+    misses: int = 0
+    uncached: int = 0
+
+    @property
+    def executions(self) -> int:
+        """Total number of executions."""
+        return self.hits + self.misses + self.uncached
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of executions which reused an already compiled statement."""
+        return self.hits / self.executions if self.executions else 0.0
+
+
+class StatementRegistry:
+    """Collects compiled cache statistics per named statement."""
+
+    def __init__(self):
+        self._stats: defaultdict[str, StatementStats] = defaultdict(StatementStats)
+
+    @staticmethod
+    def options(name: str) -> dict[str, Any]:
+        """Execution options which attach a name to a statement.
+
+        Example:
+        >> await session.execute(stmt, execution_options=registry.options("x"))
+        """
+        return {STATEMENT_NAME_OPTION: name}
+
+    def record(self, name: str, cache_hit: CacheStats) -> None:
+        """Count one execution of the statement."""
+        stats = self._stats[name]
+        if cache_hit is CacheStats.CACHE_HIT:
+            stats.hits += 1
+        elif cache_hit is CacheStats.CACHE_MISS:
+            stats.misses += 1
+        else:
+            stats.uncached += 1
+
+    def hit_ratio(self, name: str | None = None) -> float:
+        """Compiled cache hit ratio of one statement or of all of them."""
+        if name is not None:
+            return self._stats[name].hit_ratio
+        total = StatementStats(
+            hits=sum(s.hits for s in self._stats.values()),
+            misses=sum(s.misses for s in self._stats.values()),
+            uncached=sum(s.uncached for s in self._stats.values()),
+        )
+        return total.hit_ratio
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """Statistics of every statement seen so far."""
+        return {
+            name: {
+                "executions": stats.executions,
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "uncached": stats.uncached,
+                "hit_ratio": round(stats.hit_ratio, 4),
+            }
+            for name, stats in sorted(self._stats.items())
+        }
+
+    def reset(self) -> None:
+        """Forget collected statistics."""
+        self._stats.clear()
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        """Listen to executions of the engine."""
+        event.listen(engine.sync_engine, "after_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        name = context.execution_options.get(STATEMENT_NAME_OPTION, UNNAMED_STATEMENT)
+        self.record(name, context.cache_hit)
+
+
+statement_registry = StatementRegistry()
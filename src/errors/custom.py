@@ -17,3 +17,9 @@ class LimitExceedError(Exception):
     """Custom exception for limit violations."""
 
     pass
+
+
+class RenderQueueFullError(Exception):
+    """Custom exception for an overloaded report renderer."""
+
+    pass
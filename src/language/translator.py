@@ -51,20 +51,30 @@ class Translator:
                 ),
             ],
         )
+        # Runners are only used through get(), which keeps no state, so one
+        # translator per locale is shared by every update
+        self.localized = {
+            locale.value: LocalizedTranslator(
+                translator=self.translator_hub.get_translator_by_locale(
+                    locale=locale.value
+                )
+            )
+            for locale in Locales
+        }
 
     def get_text(self, key: str, language: Locales = conf.default_locale):
         """Get text from locale with key."""
-        return self.translator_hub.get_translator_by_locale(
-            locale=language  # or self.language
-        ).get(key)
-
-    def __call__(self, language: str, *args, **kwargs):
-        """When instance calles it's produces LocalizedTranslator."""
-        return LocalizedTranslator(
-            translator=self.translator_hub.get_translator_by_locale(
-                locale=language  # or self.language
-            )
-        )
+        return self(language=language).get(key)
+
+    def __call__(self, language: str | None, *args, **kwargs):
+        """When instance calles it's produces LocalizedTranslator.
+
+        Unknown languages get the translator of the root locale.
+        """
+        localized = self.localized.get(language)
+        if localized is None:
+            localized = self.localized[self.translator_hub.root_locale]
+        return localized
 
 
 class LocalizedTranslator:
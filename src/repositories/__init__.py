@@ -1,13 +1,17 @@
 """Repositories module."""
 
 from .abstract import Repository  # noqa: F401
+from .department import DepartmentRepo
 from .establishment import EstablishmentRepo
+from .report import ReportRepo
 from .transaction import TransactionRepo
 from .user import UserRepo
 
 __all__ = (
     "UserRepo",
+    "DepartmentRepo",
     "EstablishmentRepo",
     "NotificationRepo",
+    "ReportRepo",
     "TransactionRepo",
 )
@@ -1,5 +1,10 @@
+from typing import Any
+
+from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db.statements import statement_registry
+
 
 # Repository classes for data access
 class BaseRepository:
@@ -8,6 +13,14 @@ class BaseRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def execute(
+        self, name: str, statement, params: dict[str, Any] | None = None
+    ) -> Result:
+        """Execute a named statement so its compiled cache usage is tracked."""
+        return await self.session.execute(
+            statement, params, execution_options=statement_registry.options(name)
+        )
+
     async def get_by_id(self, model_class, id: int):
         """Get entity by ID."""
         return await self.session.get(model_class, id)
@@ -0,0 +1,34 @@
+"""Department repository file."""
+
+from collections.abc import Collection
+
+from sqlalchemy import insert, select
+
+from src.db.models import Department
+
+from .base import BaseRepository
+
+
+class DepartmentRepo(BaseRepository):
+    """Repository for Department operations."""
+
+    async def get_ids_by_name(self, names: Collection[str]) -> dict[str, int]:
+        """Get ids of departments by their names, the first one of duplicates."""
+        result = await self.session.execute(
+            select(Department.name, Department.id)
+            .where(Department.name.in_(names))
+            .order_by(Department.id.desc())
+        )
+        return dict(result.all())
+
+    async def create_many(self, names: Collection[str]) -> dict[str, int]:
+        """Insert departments, the caller commits.
+
+        :return: Ids of the new departments by name.
+        """
+        result = await self.session.execute(
+            insert(Department)
+            .values([{"name": name} for name in names])
+            .returning(Department.name, Department.id)
+        )
+        return dict(result.all())
@@ -1,11 +1,14 @@
 """User repository file."""
 
+from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import Row, and_, distinct, func, lambda_stmt, select
 
 from src.db.models import Establishment
 from src.db.models.transaction import Transaction, TransactionStatus, TransactionType
+from src.db.models.user import User
+from src.utils.periods import day_bounds
 
 from .base import BaseRepository
 
@@ -15,8 +18,11 @@ class EstablishmentRepo(BaseRepository):
 
     async def get_by_qr_code(self, qr_code: str) -> Establishment | None:
         """Get establishment by QR code."""
-        result = await self.session.execute(
-            select(Establishment).where(Establishment.qr_code == qr_code)
+        result = await self.execute(
+            "establishment.by_qr_code",
+            lambda_stmt(
+                lambda: select(Establishment).where(Establishment.qr_code == qr_code)
+            ),
         )
         return result.scalar_one_or_none()
 
@@ -24,45 +30,86 @@ class EstablishmentRepo(BaseRepository):
         self, owner_telegram_id: int
     ) -> Establishment | None:
         """Get establishment by owner's telegram_id."""
-        from src.db.models.user import User  # Adjust import if needed
-
-        result = await self.session.execute(
-            select(Establishment)
-            .join(User, Establishment.owner_id == User.id)
-            .where(User.telegram_id == owner_telegram_id)
+        result = await self.execute(
+            "establishment.by_owner_telegram_id",
+            lambda_stmt(
+                lambda: select(Establishment)
+                .join(User, Establishment.owner_id == User.id)
+                .where(User.telegram_id == owner_telegram_id)
+            ),
         )
         return result.scalar_one_or_none()
 
     async def get_active_establishments(self) -> list[Establishment]:
         """Get all active establishments."""
-        result = await self.session.execute(
-            select(Establishment).where(Establishment.is_active)
+        result = await self.execute(
+            "establishment.active",
+            lambda_stmt(lambda: select(Establishment).where(Establishment.is_active)),
         )
         return result.scalars().all()
 
     async def get_total_revenue(self, establishment_id: int) -> Decimal:
         """Get total revenue for establishment."""
-        result = await self.session.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                and_(
+        result = await self.execute(
+            "establishment.total_revenue",
+            lambda_stmt(
+                lambda: select(func.coalesce(func.sum(Transaction.amount), 0)).where(
                     Transaction.establishment_id == establishment_id,
                     Transaction.type == TransactionType.PAYMENT,
                     Transaction.status == TransactionStatus.COMPLETED,
                 )
-            )
+            ),
         )
         return Decimal(str(result.scalar() or 0))
 
     async def get_today_revenue(self, establishment_id: int) -> Decimal:
         """Get today's revenue for establishment."""
-        result = await self.session.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                and_(
+        day_start, day_end = day_bounds()
+        result = await self.execute(
+            "establishment.today_revenue",
+            lambda_stmt(
+                lambda: select(func.coalesce(func.sum(Transaction.amount), 0)).where(
                     Transaction.establishment_id == establishment_id,
                     Transaction.type == TransactionType.PAYMENT,
                     Transaction.status == TransactionStatus.COMPLETED,
-                    func.date(Transaction.created_at) == func.current_date(),
+                    Transaction.created_at >= day_start,
+                    Transaction.created_at < day_end,
                 )
-            )
+            ),
         )
         return Decimal(str(result.scalar() or 0))
+
+    async def get_daily_figures(
+        self, day_start: datetime, day_end: datetime
+    ) -> list[Row]:
+        """Get figures of every active establishment with an owner in one query.
+
+        :return: Rows of owner telegram_id, establishment id and name,
+            revenue, orders and distinct customers, ordered by owner.
+        """
+        result = await self.execute(
+            "establishment.daily_figures",
+            select(
+                User.telegram_id,
+                Establishment.id,
+                Establishment.name,
+                func.coalesce(func.sum(Transaction.amount), 0),
+                func.count(Transaction.id),
+                func.count(distinct(Transaction.user_id)),
+            )
+            .join(User, Establishment.owner_id == User.id)
+            .outerjoin(
+                Transaction,
+                and_(
+                    Transaction.establishment_id == Establishment.id,
+                    Transaction.type == TransactionType.PAYMENT,
+                    Transaction.status == TransactionStatus.COMPLETED,
+                    Transaction.created_at >= day_start,
+                    Transaction.created_at < day_end,
+                ),
+            )
+            .where(Establishment.is_active)
+            .group_by(User.telegram_id, Establishment.id)
+            .order_by(User.telegram_id, Establishment.id),
+        )
+        return result.all()
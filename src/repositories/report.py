@@ -0,0 +1,95 @@
+"""Report repository file."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+
+from src.db.models.report import ACTIVE_REPORT_CONDITION, Report, ReportStatus
+
+from .base import BaseRepository
+
+ACTIVE_STATUSES = (ReportStatus.PENDING, ReportStatus.RUNNING)
+
+
+class ReportRepo(BaseRepository):
+    """Repository for Report operations."""
+
+    async def get_expired(self, moment: datetime) -> list[Report]:
+        """Get reports which expired before the moment."""
+        result = await self.session.execute(
+            select(Report).where(Report.expires_at < moment)
+        )
+        return result.scalars().all()
+
+    async def delete_by_ids(self, ids: list[int]) -> None:
+        """Delete reports by their ids."""
+        await self.session.execute(delete(Report).where(Report.id.in_(ids)))
+        await self.session.commit()
+
+    async def enqueue(self, values: dict[str, Any]) -> int | None:
+        """Insert a pending report job unless the same job is already active.
+
+        :param values: Column values of the job, dedup_key included
+        :return: Id of the new job or None for a duplicate.
+        """
+        result = await self.session.execute(
+            insert(Report)
+            .values(status=ReportStatus.PENDING, **values)
+            .on_conflict_do_nothing(
+                index_elements=[Report.dedup_key],
+                index_where=text(ACTIVE_REPORT_CONDITION),
+            )
+            .returning(Report.id)
+        )
+        await self.session.commit()
+        return result.scalar_one_or_none()
+
+    async def get_active_by_dedup_key(self, dedup_key: str) -> Report | None:
+        """Get a pending or running job by its dedup key."""
+        result = await self.session.execute(
+            select(Report).where(
+                Report.dedup_key == dedup_key,
+                Report.status.in_(ACTIVE_STATUSES),
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def claim_next(self, moment: datetime) -> Report | None:
+        """Take the oldest pending job and mark it as running.
+
+        Rows locked by other workers are skipped, so several workers never
+        claim the same job.
+        """
+        result = await self.session.execute(
+            select(Report)
+            .where(Report.status == ReportStatus.PENDING)
+            .order_by(Report.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            await self.session.rollback()
+            return None
+
+        job.status = ReportStatus.RUNNING
+        job.started_at = moment
+        return await self.update(job)
+
+    async def requeue_stale(self, started_before: datetime) -> int:
+        """Return jobs which have been running since before the moment to the queue.
+
+        :return: Number of requeued jobs.
+        """
+        result = await self.session.execute(
+            update(Report)
+            .where(
+                Report.status == ReportStatus.RUNNING,
+                Report.started_at < started_before,
+            )
+            .values(status=ReportStatus.PENDING, started_at=None)
+        )
+        await self.session.commit()
+        return result.rowcount
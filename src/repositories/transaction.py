@@ -1,13 +1,22 @@
 """User repository file."""
 
+from collections.abc import AsyncIterator
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import BigInteger, Row, Select, String, func, select, tuple_
 
-from src.db.models.transaction import Transaction, TransactionStatus
+from src.db.models.establishment import Establishment
+from src.db.models.transaction import Transaction, TransactionStatus, TransactionType
+from src.db.models.user import User
 
 from .base import BaseRepository
 
+USER_DISPLAY_NAME = func.coalesce(
+    func.nullif(func.concat_ws(" ", User.first_name, User.last_name), ""),
+    User.username,
+    func.concat("User ", User.telegram_id),
+)
+
 
 class TransactionRepo(BaseRepository):
     """Repository for Transaction operations."""
@@ -82,3 +91,95 @@ class TransactionRepo(BaseRepository):
             )
         )
         return result.scalars().all()
+
+    async def get_establishment_report_columns(
+        self, establishment_id: int, start_date: datetime, end_date: datetime
+    ) -> dict[str, list]:
+        """Get completed payments of the period as columns.
+
+        Rows are fetched as plain tuples without ORM objects, amounts are
+        returned as integer cents so they can be summed exactly.
+        """
+        result = await self.execute(
+            "transaction.report_columns",
+            select(
+                Transaction.created_at,
+                (Transaction.amount * 100).cast(BigInteger).label("amount_cents"),
+                Transaction.user_id,
+                USER_DISPLAY_NAME.label("user_name"),
+            )
+            .join(User, Transaction.user_id == User.id)
+            .where(
+                Transaction.establishment_id == establishment_id,
+                Transaction.type == TransactionType.PAYMENT,
+                Transaction.status == TransactionStatus.COMPLETED,
+                Transaction.created_at >= start_date,
+                Transaction.created_at < end_date,
+            ),
+        )
+        columns = ("created_at", "amount_cents", "user_id", "user_name")
+        values = list(zip(*result.all())) or [()] * len(columns)
+        return {name: list(column) for name, column in zip(columns, values)}
+
+    async def get_page(
+        self,
+        before: tuple[datetime, int] | None = None,
+        limit: int = 50,
+        status: TransactionStatus | None = None,
+        type: TransactionType | None = None,
+        establishment_id: int | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> list[Row]:
+        """Get a page of transactions as plain rows, newest first.
+
+        :param before: created_at and id of the last row of the previous page
+        :param end_date: Exclusive upper bound of created_at
+        """
+        query = _listing_query()
+        if before is not None:
+            query = query.where(
+                tuple_(Transaction.created_at, Transaction.id) < tuple_(*before)
+            )
+        if status is not None:
+            query = query.where(Transaction.status == status)
+        if type is not None:
+            query = query.where(Transaction.type == type)
+        if establishment_id is not None:
+            query = query.where(Transaction.establishment_id == establishment_id)
+        if start_date is not None:
+            query = query.where(Transaction.created_at >= start_date)
+        if end_date is not None:
+            query = query.where(Transaction.created_at < end_date)
+
+        result = await self.execute("transaction.page", query.limit(limit))
+        return result.all()
+
+    async def stream_export_rows(self, batch_size: int = 2000) -> AsyncIterator[Row]:
+        """Stream every transaction as a plain row, newest first.
+
+        Rows are read through a server-side cursor, batch_size at a time.
+        """
+        result = await self.session.stream(
+            _listing_query().execution_options(yield_per=batch_size)
+        )
+        async for row in result:
+            yield row
+
+
+def _listing_query() -> Select:
+    """Transactions with user and establishment names, newest first."""
+    return (
+        select(
+            Transaction.id,
+            Transaction.created_at,
+            USER_DISPLAY_NAME.label("user_name"),
+            func.coalesce(Establishment.name, "Системная").label("establishment_name"),
+            Transaction.amount,
+            func.lower(Transaction.type.cast(String)).label("type"),
+            func.lower(Transaction.status.cast(String)).label("status"),
+        )
+        .join(User, Transaction.user_id == User.id)
+        .outerjoin(Establishment, Transaction.establishment_id == Establishment.id)
+        .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+    )
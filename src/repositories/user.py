@@ -1,13 +1,17 @@
 """User repository file."""
 
+from collections.abc import Sequence
 from decimal import Decimal
+from typing import Any
 
-from sqlalchemy import and_, extract, func, select
+from sqlalchemy import and_, extract, func, lambda_stmt, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
 
 from src.bot.structures.role import Role
 from src.db.models import User
 from src.db.models.transaction import Transaction, TransactionStatus, TransactionType
 from src.db.models.user import UserRole
+from src.utils.periods import day_bounds
 
 from .base import BaseRepository
 
@@ -47,10 +51,37 @@ class UserRepo(BaseRepository):
         )
         await self.session.commit()
 
+    async def upsert_many(self, values: Sequence[dict[str, Any]]) -> tuple[int, int]:
+        """Insert users or update those with a known telegram id, in one statement.
+
+        Missing values keep the stored ones. Telegram ids must be unique
+        within the batch. The caller commits.
+
+        :param values: Column values of every user, the same columns in each
+        :return: Numbers of created and updated users.
+        """
+        stmt = insert(User).values(list(values))
+        updated_columns = {
+            name: func.coalesce(stmt.excluded[name], User.__table__.c[name])
+            for name in values[0]
+            if name != "telegram_id"
+        }
+        result = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[User.telegram_id],
+                set_={**updated_columns, "updated_at": stmt.excluded.updated_at},
+            )
+            # xmax is zero for rows inserted by the statement
+            .returning(literal_column("xmax = 0"))
+        )
+        created = sum(result.scalars().all())
+        return created, len(values) - created
+
     async def get_by_telegram_id(self, telegram_id: int) -> User | None:
         """Get user by telegram ID."""
-        result = await self.session.execute(
-            select(User).where(User.telegram_id == telegram_id)
+        result = await self.execute(
+            "user.by_telegram_id",
+            lambda_stmt(lambda: select(User).where(User.telegram_id == telegram_id)),
         )
         return result.scalar_one_or_none()
 
@@ -68,15 +99,18 @@ class UserRepo(BaseRepository):
 
     async def get_today_spent(self, user_id: int) -> Decimal:
         """Get amount spent by user today."""
-        result = await self.session.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                and_(
+        day_start, day_end = day_bounds()
+        result = await self.execute(
+            "user.today_spent",
+            lambda_stmt(
+                lambda: select(func.coalesce(func.sum(Transaction.amount), 0)).where(
                     Transaction.user_id == user_id,
                     Transaction.type == TransactionType.PAYMENT,
                     Transaction.status == TransactionStatus.COMPLETED,
-                    func.date(Transaction.created_at) == func.current_date(),
+                    Transaction.created_at >= day_start,
+                    Transaction.created_at < day_end,
                 )
-            )
+            ),
         )
         return Decimal(str(result.scalar() or 0))
 
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+
+@dataclass
+class ReportFile:
+    """Data class for a rendered report."""
+
+    filename: str
+    content: bytes
+
+
+@dataclass
+class EstablishmentDigest:
+    """Data class for the daily figures of an establishment."""
+
+    owner_telegram_id: int
+    establishment_id: int
+    name: str
+    day: date
+    revenue: Decimal
+    orders: int
+    customers: int
+
+    @property
+    def average_order_value(self) -> Decimal:
+        return self.revenue / self.orders if self.orders else Decimal("0")
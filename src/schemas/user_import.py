@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ImportedUser:
+    """Data class for an employee row of an import file."""
+
+    row: int
+    telegram_id: int
+    username: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+    phone: str | None = None
+    email: str | None = None
+    department: str | None = None
+
+
+@dataclass
+class ImportRowError:
+    """Data class for a rejected row of an import file."""
+
+    row: int
+    message: str
+
+
+@dataclass
+class ImportResult:
+    """Data class for the outcome of an import."""
+
+    created: int = 0
+    updated: int = 0
+    departments_created: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
@@ -2,6 +2,7 @@ from decimal import Decimal
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import ReportCache
 from src.db.models.transaction import Transaction, TransactionStatus, TransactionType
 from src.db.models.user import User, UserRole
 from src.repositories.transaction import TransactionRepo
@@ -14,11 +15,11 @@ from .transaction import TransactionService
 class BalanceService:
     """Service for balance management operations."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, report_cache: ReportCache | None = None):
         self.session = session
         self.user_repo = UserRepo(session)
         self.transaction_repo = TransactionRepo(session)
-        self.transaction_service = TransactionService(session)
+        self.transaction_service = TransactionService(session, report_cache)
 
     async def top_up_balance(self, request: BalanceTopUpRequest) -> PaymentResult:
         """Top up user balance."""
@@ -0,0 +1,265 @@
+"""Admin dashboard statistics.
+
+The aggregates are independent of each other, so each one runs on its own
+pooled connection and they are awaited together. A semaphore caps how many
+connections the dashboard takes from the pool at once.
+"""
+
+import asyncio
+import math
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Row, func, literal, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.configuration import conf
+from src.db.models.department import Department
+from src.db.models.establishment import Establishment
+from src.db.models.transaction import Transaction, TransactionStatus
+from src.db.models.user import User
+from src.db.statements import statement_registry
+from src.repositories.transaction import USER_DISPLAY_NAME
+from src.utils.periods import GRANULARITIES, bucket_starts, truncate
+
+TOTALS = select(
+    select(func.count(User.id)).scalar_subquery(),
+    select(func.coalesce(func.sum(Transaction.amount), 0))
+    .where(Transaction.status == TransactionStatus.COMPLETED)
+    .scalar_subquery(),
+    select(func.count(Establishment.id))
+    .where(Establishment.is_active)
+    .scalar_subquery(),
+)
+
+
+
+def spending_filters(
+    status: TransactionStatus | None = TransactionStatus.COMPLETED,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+) -> list:
+    """Transaction conditions shared by the spending aggregates.
+
+    :param status: Status of counted transactions, any when None
+    :param end_date: Exclusive end of the range
+    """
+    conditions = []
+    if status is not None:
+        conditions.append(Transaction.status == status)
+    if start_date is not None:
+        conditions.append(Transaction.created_at >= start_date)
+    if end_date is not None:
+        conditions.append(Transaction.created_at < end_date)
+    return conditions
+
+
+def department_spending_query(*conditions):
+    """Spending summed per department."""
+    return (
+        select(Department.name, func.sum(Transaction.amount))
+        .select_from(Department)
+        .join(User, User.department_id == Department.id)
+        .join(Transaction, Transaction.user_id == User.id)
+        .where(*conditions)
+        .group_by(Department.name)
+    )
+
+
+def establishment_spending_query(*conditions):
+    """Spending summed per establishment."""
+    return (
+        select(Establishment.name, func.sum(Transaction.amount))
+        .select_from(Establishment)
+        .join(Transaction, Transaction.establishment_id == Establishment.id)
+        .where(*conditions)
+        .group_by(Establishment.name)
+    )
+
+
+USER_SPENDING = (
+    select(
+        USER_DISPLAY_NAME,
+        Department.name,
+        func.sum(Transaction.amount).label("total_spent"),
+    )
+    .join(Transaction, Transaction.user_id == User.id)
+    .join(Department, User.department_id == Department.id, isouter=True)
+    .where(Transaction.status == TransactionStatus.COMPLETED)
+    .group_by(User.id, Department.name)
+    .order_by(func.sum(Transaction.amount).desc())
+)
+
+TIME_SERIES_GROUPS = ("establishment", "department")
+NO_DEPARTMENT = "Не указан"
+
+
+def time_series_query(
+    granularity: str, group_by: str, start_date: datetime, end_date: datetime
+):
+    """Completed spending of the range summed per bucket and group."""
+    bucket = func.date_trunc(
+        literal(granularity, literal_execute=True), Transaction.created_at
+    ).label("bucket")
+    if group_by == "establishment":
+        group = Establishment.name
+        query = select(bucket, group, func.sum(Transaction.amount)).join(
+            Establishment, Transaction.establishment_id == Establishment.id
+        )
+    else:
+        group = Department.name
+        query = (
+            select(bucket, group, func.sum(Transaction.amount))
+            .join(User, Transaction.user_id == User.id)
+            .outerjoin(Department, User.department_id == Department.id)
+        )
+    return (
+        query.where(
+            Transaction.status == TransactionStatus.COMPLETED,
+            Transaction.created_at >= start_date,
+            Transaction.created_at < end_date,
+        )
+        .group_by(bucket, group)
+        .order_by(bucket)
+    )
+
+
+class DashboardService:
+    """Service which computes admin dashboard statistics concurrently."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        concurrency: int = conf.admin.dashboard_concurrency,
+    ):
+        """Initialize service.
+
+        :param session_factory: Factory of sessions, one per query
+        :param concurrency: Queries running at once across all requests.
+        """
+        self.session_factory = session_factory
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(self, name: str, statement) -> list[Row]:
+        """Run a statement on its own session within the concurrency cap."""
+        async with self.semaphore, self.session_factory() as session:
+            result = await session.execute(
+                statement, execution_options=statement_registry.options(name)
+            )
+            return result.all()
+
+    async def stream(self, name: str, statement) -> AsyncIterator[Row]:
+        """Stream rows of a statement through a server-side cursor.
+
+        The connection is held, within the concurrency cap, until the rows
+        are consumed.
+        """
+        async with self.semaphore, self.session_factory() as session:
+            result = await session.stream(
+                statement, execution_options=statement_registry.options(name)
+            )
+            async for row in result:
+                yield row
+
+    async def get_statistics(self) -> dict[str, Any]:
+        """Compute every dashboard aggregate.
+
+        :return: Plain values ready for the template.
+        """
+        totals, departments, establishments, users = await asyncio.gather(
+            self.fetch("dashboard.totals", TOTALS),
+            self.fetch(
+                "dashboard.department_spending",
+                department_spending_query(*spending_filters()),
+            ),
+            self.fetch(
+                "dashboard.establishment_spending",
+                establishment_spending_query(*spending_filters()),
+            ),
+            self.fetch("dashboard.user_spending", USER_SPENDING),
+        )
+        total_users, total_spending, active_establishments = totals[0]
+        total_spending = float(total_spending)
+
+        establishment_spending = [
+            {
+                "name": name,
+                "spending": float(spending),
+                "share": round(float(spending) / total_spending * 100, 2)
+                if total_spending > 0
+                else 0,
+            }
+            for name, spending in establishments
+        ]
+        return {
+            "total_users": total_users,
+            "total_spending": total_spending,
+            "active_establishments": active_establishments,
+            "department_spending": [
+                [name, float(spending)] for name, spending in departments
+            ],
+            "establishment_spending_with_shares": establishment_spending,
+            "user_spending_by_department": [
+                {
+                    "full_name": full_name,
+                    "department_name": department_name,
+                    "total_spent": float(total_spent),
+                }
+                for full_name, department_name, total_spent in users
+            ],
+            "establishment_chart_data": [
+                {"name": item["name"], "spending": item["spending"]}
+                for item in establishment_spending
+            ],
+        }
+
+    async def get_time_series(
+        self,
+        granularity: str,
+        group_by: str,
+        start_date: datetime,
+        end_date: datetime,
+        max_points: int,
+    ) -> dict[str, Any]:
+        """Get spending per bucket of the range for every group.
+
+        Buckets are made coarser, hour to day to week, until the range fits
+        into max_points, and remaining extra buckets are summed in groups of
+        step consecutive ones.
+
+        :param granularity: Finest bucket size, one of GRANULARITIES
+        :param group_by: Either "establishment" or "department"
+        :param end_date: Exclusive end of the range
+        :return: Bucket starts and one series of values per group.
+        """
+        granularities = list(GRANULARITIES)
+        for granularity in granularities[granularities.index(granularity) :]:
+            span = end_date - truncate(start_date, granularity)
+            if span / GRANULARITIES[granularity] <= max_points:
+                break
+
+        rows = await self.fetch(
+            f"dashboard.time_series.{group_by}",
+            time_series_query(granularity, group_by, start_date, end_date),
+        )
+
+        buckets = bucket_starts(start_date, end_date, granularity)
+        step = max(math.ceil(len(buckets) / max_points), 1)
+        positions = {bucket: index // step for index, bucket in enumerate(buckets)}
+        points = math.ceil(len(buckets) / step)
+
+        series = defaultdict(lambda: [0.0] * points)
+        for bucket, name, total in rows:
+            series[name or NO_DEPARTMENT][positions[bucket]] += float(total)
+
+        return {
+            "granularity": granularity,
+            "step": step,
+            "buckets": [bucket.isoformat() for bucket in buckets[::step]],
+            "series": [
+                {"name": name, "values": [round(value, 2) for value in values]}
+                for name, values in sorted(series.items())
+            ],
+        }
@@ -0,0 +1,43 @@
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.establishment import EstablishmentRepo
+from src.schemas.report import EstablishmentDigest
+from src.utils.periods import day_bounds
+
+
+class DigestService:
+    """Service for daily revenue digests of establishments."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.establishment_repo = EstablishmentRepo(session)
+
+    async def get_daily_digests(
+        self, moment: datetime | None = None
+    ) -> dict[int, list[EstablishmentDigest]]:
+        """Get figures of the day for every owner in one grouped query.
+
+        :param moment: Any moment of the day, now by default
+        :return: Digests keyed by owner telegram_id.
+        """
+        day_start, day_end = day_bounds(moment)
+        rows = await self.establishment_repo.get_daily_figures(day_start, day_end)
+
+        digests = defaultdict(list)
+        for telegram_id, establishment_id, name, revenue, orders, customers in rows:
+            digests[telegram_id].append(
+                EstablishmentDigest(
+                    owner_telegram_id=telegram_id,
+                    establishment_id=establishment_id,
+                    name=name,
+                    day=day_start.date(),
+                    revenue=Decimal(str(revenue)),
+                    orders=orders,
+                    customers=customers,
+                )
+            )
+        return dict(digests)
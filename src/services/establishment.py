@@ -5,14 +5,18 @@ from typing import Any
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.configuration import conf
 from src.db.models.establishment import Establishment
 from src.db.models.transaction import Transaction, TransactionStatus, TransactionType
 from src.errors.custom import ValidationError
 from src.repositories.establishment import EstablishmentRepo
 from src.repositories.transaction import TransactionRepo
+from src.schemas.report import ReportFile
+from src.services.report_store import ReportStore
 from src.utils.excel_write import write_revenue_excel
 from src.utils.pdf_write import write_revenue_pdf
-from pathlib import Path
+from src.utils.render_pool import report_renderer
+from src.utils.report_builder import build_detailed_report
 
 
 class EstablishmentService:
@@ -22,6 +26,7 @@ class EstablishmentService:
         self.session = session
         self.establishment_repo = EstablishmentRepo(session)
         self.transaction_repo = TransactionRepo(session)
+        self.report_store = ReportStore(session)
 
     async def get_establishment_by_qr(self, qr_code: str) -> Establishment | None:
         """Get establishment by QR code."""
@@ -99,6 +104,7 @@ class EstablishmentService:
         return {
             "establishment_id": establishment_id,
             "name": establishment.name,
+            "owner_id": establishment.owner_id,
             "total_revenue": total_revenue,
             "today_revenue": today_revenue,
             "total_orders": total_orders,
@@ -123,23 +129,69 @@ class EstablishmentService:
             establishment.id, start_date, end_date, limit, offset
         )
 
-    async def get_revenue_summary_in_pdf(self, establishment_id: int):
+    async def get_revenue_summary_in_pdf(self, establishment_id: int) -> ReportFile:
         """Generate revenue summary report in PDF format."""
-        summary = await self.get_establishment_revenue_summary(establishment_id)
-        reports_dir = Path(__file__).parent.parent.parent / "reports"
-        reports_dir.mkdir(parents=True, exist_ok=True)
-        pdf_filename = reports_dir / f"revenue-summary_{datetime.now().strftime('%d-%m-%Y %H-%M-%S')}.pdf"
-        result = write_revenue_pdf(data=summary, filename=str(pdf_filename))
-        if result:
-            return str(pdf_filename)
-
-    async def get_revenue_summary_in_excel(self, establishment_id: int):
+        return await self._render_revenue_summary(
+            establishment_id, write_revenue_pdf, "pdf"
+        )
+
+    async def get_revenue_summary_in_excel(self, establishment_id: int) -> ReportFile:
         """Generate revenue summary report in XLSX format."""
+        return await self._render_revenue_summary(
+            establishment_id, write_revenue_excel, "xlsx"
+        )
+
+    async def get_detailed_report(
+        self,
+        establishment_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        report_format: str,
+    ) -> ReportFile:
+        """Generate per-day, per-hour and per-employee report of the period."""
+        establishment = await self.establishment_repo.get_by_id(
+            Establishment, establishment_id
+        )
+        if not establishment:
+            raise ValidationError(f"Establishment with id {establishment_id} not found")
 
+        columns = await self.transaction_repo.get_establishment_report_columns(
+            establishment_id, start_date, end_date
+        )
+        content = await report_renderer.render(
+            build_detailed_report,
+            columns,
+            establishment.name,
+            start_date,
+            end_date,
+            report_format,
+        )
+        return ReportFile(
+            filename=f"report_{establishment_id}_{start_date:%d-%m-%Y}_"
+            f"{end_date:%d-%m-%Y}.{report_format}",
+            content=content,
+        )
+
+    async def _render_revenue_summary(
+        self, establishment_id: int, writer, extension: str
+    ) -> ReportFile:
+        """Render the revenue summary in memory and optionally persist it."""
         summary = await self.get_establishment_revenue_summary(establishment_id)
-        reports_dir = Path(__file__).parent.parent.parent / "reports"
-        reports_dir.mkdir(parents=True, exist_ok=True)
-        xlsx_filename = reports_dir / f"revenue-summary_{datetime.now().strftime('%d-%m-%Y %H-%M-%S')}.xlsx"
-        result = write_revenue_excel(data=summary, filename=str(xlsx_filename))
-        if result:
-            return str(xlsx_filename)
+        content = await report_renderer.render(writer, data=summary)
+        report = ReportFile(
+            filename=f"revenue-summary_{establishment_id}_"
+            f"{datetime.now().strftime('%d-%m-%Y %H-%M-%S')}.{extension}",
+            content=content,
+        )
+
+        owner_id = summary["owner_id"]
+        if conf.reports.persist and owner_id is not None:
+            await self.report_store.save(
+                report,
+                title=f"Revenue summary for {summary['name']}",
+                report_type="establishment",
+                report_format=extension,
+                generated_by=owner_id,
+                parameters={"establishment_id": establishment_id},
+            )
+        return report
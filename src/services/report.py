@@ -1,99 +1,150 @@
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import and_, extract, func, select
+from sqlalchemy import DateTime, and_, bindparam, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import Cache, SummaryCache
 from src.db.models.transaction import Transaction, TransactionStatus, TransactionType
 from src.db.models.user import User, UserRole
+from src.db.statements import statement_registry
 from src.repositories.establishment import EstablishmentRepo
 from src.repositories.transaction import TransactionRepo
 from src.repositories.user import UserRepo
+from src.utils.periods import day_bounds, month_bounds
+
+_BREAKDOWN_PARAMS = (
+    bindparam("payment", type_=Transaction.__table__.c.type.type),
+    bindparam("completed", type_=Transaction.__table__.c.status.type),
+    bindparam("day_start", type_=DateTime()),
+    bindparam("day_end", type_=DateTime()),
+)
+
+ESTABLISHMENT_BREAKDOWN = text(
+    """
+    SELECT
+        e.id,
+        e.name,
+        COALESCE(SUM(t.amount), 0) as total_revenue,
+        COUNT(t.id) as total_orders,
+        COALESCE(SUM(t.amount) FILTER (
+            WHERE t.created_at >= :day_start AND t.created_at < :day_end
+        ), 0) as today_revenue
+    FROM establishments e
+    LEFT JOIN transactions t ON e.id = t.establishment_id
+        AND t.type = :payment
+        AND t.status = :completed
+    GROUP BY e.id, e.name
+    ORDER BY total_revenue DESC
+    """
+).bindparams(*_BREAKDOWN_PARAMS)
+
+DEPARTMENT_BREAKDOWN = text(
+    """
+    SELECT
+        d.id,
+        d.name,
+        COUNT(DISTINCT u.id) as employee_count,
+        COALESCE(SUM(t.amount), 0) as total_spending,
+        COALESCE(SUM(t.amount) FILTER (
+            WHERE t.created_at >= :day_start AND t.created_at < :day_end
+        ), 0) as today_spending
+    FROM departments d
+    LEFT JOIN users u ON d.id = u.department_id AND u.role = :employee
+    LEFT JOIN transactions t ON u.id = t.user_id
+        AND t.type = :payment
+        AND t.status = :completed
+    GROUP BY d.id, d.name
+    ORDER BY total_spending DESC
+    """
+).bindparams(
+    bindparam("employee", type_=User.__table__.c.role.type), *_BREAKDOWN_PARAMS
+)
 
 
 class ReportService:
     """Service for report generation and analytics."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: Cache | None = None):
+        """Initialize service.
+
+        :param cache: Cache sharing the company summary, computed on every
+        call when omitted.
+        """
         self.session = session
+        self.summary_cache = SummaryCache(cache) if cache is not None else None
         self.user_repo = UserRepo(session)
         self.establishment_repo = EstablishmentRepo(session)
         self.transaction_repo = TransactionRepo(session)
 
     async def get_company_summary(self) -> dict[str, Any]:
-        """Get overall company spending summary."""
-        # Total spending
-        result = await self.session.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                and_(
-                    Transaction.type == TransactionType.PAYMENT,
-                    Transaction.status == TransactionStatus.COMPLETED,
-                )
-            )
-        )
-        total_spending = Decimal(str(result.scalar() or 0))
+        """Get overall company spending summary.
 
-        # Today's spending
-        result = await self.session.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                and_(
-                    Transaction.type == TransactionType.PAYMENT,
-                    Transaction.status == TransactionStatus.COMPLETED,
-                    func.date(Transaction.created_at) == func.current_date(),
-                )
-            )
+        With a cache, the result is computed once for the bot and the admin
+        and kept for ``conf.cache.summary_ttl`` seconds.
+        """
+        if self.summary_cache is None:
+            return await self._compute_company_summary()
+        return await self.summary_cache.get(self._compute_company_summary)
+
+    async def _compute_company_summary(self) -> dict[str, Any]:
+        """Compute the company summary in a single pass over transactions."""
+        day_start, day_end = day_bounds()
+        month_start, month_end = month_bounds()
+
+        active_users = (
+            select(func.count(User.id))
+            .where(and_(User.is_active, User.role == UserRole.EMPLOYEE))
+            .scalar_subquery()
         )
-        today_spending = Decimal(str(result.scalar() or 0))
-
-        # This month's spending
         result = await self.session.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
+            select(
+                func.coalesce(func.sum(Transaction.amount), 0).label("total"),
+                func.coalesce(
+                    func.sum(Transaction.amount).filter(
+                        Transaction.created_at >= day_start,
+                        Transaction.created_at < day_end,
+                    ),
+                    0,
+                ).label("today"),
+                func.coalesce(
+                    func.sum(Transaction.amount).filter(
+                        Transaction.created_at >= month_start,
+                        Transaction.created_at < month_end,
+                    ),
+                    0,
+                ).label("month"),
+                active_users.label("active_users"),
+            ).where(
                 and_(
                     Transaction.type == TransactionType.PAYMENT,
                     Transaction.status == TransactionStatus.COMPLETED,
-                    extract("month", Transaction.created_at)
-                    == extract("month", func.current_date()),
-                    extract("year", Transaction.created_at)
-                    == extract("year", func.current_date()),
                 )
-            )
-        )
-        month_spending = Decimal(str(result.scalar() or 0))
-
-        # Active users count
-        result = await self.session.execute(
-            select(func.count(User.id)).where(
-                and_(User.is_active, User.role == UserRole.EMPLOYEE)
-            )
+            ),
+            execution_options=statement_registry.options("report.company_summary"),
         )
-        active_users = result.scalar() or 0
+        row = result.one()
 
         return {
-            "total_spending": total_spending,
-            "today_spending": today_spending,
-            "month_spending": month_spending,
-            "active_users": active_users,
+            "total_spending": Decimal(str(row.total or 0)),
+            "today_spending": Decimal(str(row.today or 0)),
+            "month_spending": Decimal(str(row.month or 0)),
+            "active_users": row.active_users or 0,
         }
 
     async def get_establishment_breakdown(self) -> list[dict[str, Any]]:
         """Get spending breakdown by establishment."""
-        query = """
-        SELECT
-            e.id,
-            e.name,
-            COALESCE(SUM(t.amount), 0) as total_revenue,
-            COUNT(t.id) as total_orders,
-            COALESCE(SUM(CASE WHEN DATE(t.created_at) =
-            CURRENT_DATE THEN t.amount ELSE 0 END), 0) as today_revenue
-        FROM establishments e
-        LEFT JOIN transactions t ON e.id = t.establishment_id
-            AND t.type = 'payment'
-            AND t.status = 'completed'
-        GROUP BY e.id, e.name
-        ORDER BY total_revenue DESC
-        """
-
-        result = await self.session.execute(query)
+        day_start, day_end = day_bounds()
+        result = await self.session.execute(
+            ESTABLISHMENT_BREAKDOWN,
+            {
+                "payment": TransactionType.PAYMENT,
+                "completed": TransactionStatus.COMPLETED,
+                "day_start": day_start,
+                "day_end": day_end,
+            },
+            execution_options=statement_registry.options("report.establishments"),
+        )
         establishments = []
 
         for row in result:
@@ -111,24 +162,18 @@ class ReportService:
 
     async def get_department_breakdown(self) -> list[dict[str, Any]]:
         """Get spending breakdown by department."""
-        query = """
-        SELECT
-            d.id,
-            d.name,
-            COUNT(DISTINCT u.id) as employee_count,
-            COALESCE(SUM(t.amount), 0) as total_spending,
-            COALESCE(SUM(CASE WHEN DATE(t.created_at) =
-            CURRENT_DATE THEN t.amount ELSE 0 END), 0) as today_spending
-        FROM departments d
-        LEFT JOIN users u ON d.id = u.department_id AND u.role = 'employee'
-        LEFT JOIN transactions t ON u.id = t.user_id
-            AND t.type = 'payment'
-            AND t.status = 'completed'
-        GROUP BY d.id, d.name
-        ORDER BY total_spending DESC
-        """
-
-        result = await self.session.execute(query)
+        day_start, day_end = day_bounds()
+        result = await self.session.execute(
+            DEPARTMENT_BREAKDOWN,
+            {
+                "employee": UserRole.EMPLOYEE,
+                "payment": TransactionType.PAYMENT,
+                "completed": TransactionStatus.COMPLETED,
+                "day_start": day_start,
+                "day_end": day_end,
+            },
+            execution_options=statement_registry.options("report.departments"),
+        )
         departments = []
 
         for row in result:
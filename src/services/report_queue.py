@@ -0,0 +1,101 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.configuration import conf
+from src.db.models.report import Report, ReportStatus
+from src.repositories.report import ReportRepo
+from src.schemas.report import ReportFile
+from src.services.report_store import ReportStore
+
+
+class ReportQueue:
+    """Service which queues report jobs for the report worker."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        timeout: timedelta = timedelta(seconds=conf.reports.job_timeout),
+    ):
+        self.session = session
+        self.timeout = timeout
+        self.report_repo = ReportRepo(session)
+        self.report_store = ReportStore(session)
+
+    @staticmethod
+    def dedup_key(
+        report_type: str,
+        report_format: str,
+        parameters: dict[str, Any],
+        chat_id: int,
+    ) -> str:
+        """Key which is equal for identical jobs of one chat."""
+        payload = json.dumps(
+            [report_type, report_format, parameters, chat_id], sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def enqueue(
+        self,
+        title: str,
+        report_type: str,
+        report_format: str,
+        parameters: dict[str, Any],
+        generated_by: int,
+        chat_id: int,
+    ) -> bool:
+        """Queue a report job.
+
+        :return: False when an identical job is already pending or running.
+        """
+        job_id = await self.report_repo.enqueue(
+            {
+                "title": title,
+                "type": report_type,
+                "format": report_format,
+                "parameters": parameters,
+                "generated_by": generated_by,
+                "chat_id": chat_id,
+                "dedup_key": self.dedup_key(
+                    report_type, report_format, parameters, chat_id
+                ),
+            }
+        )
+        return job_id is not None
+
+    async def claim(self) -> Report | None:
+        """Take the next pending job."""
+        return await self.report_repo.claim_next(datetime.utcnow())
+
+    async def complete(self, job: Report, report: ReportFile) -> Report:
+        """Keep the rendered file until it expires and mark the job as done."""
+        return await self.report_store.attach(job, report)
+
+    async def fail(self, job: Report, error: str) -> Report:
+        """Mark the job as failed, it is purged like a finished report."""
+        now = datetime.utcnow()
+        job.status = ReportStatus.FAILED
+        job.error = error
+        job.generated_at = now
+        job.expires_at = now + self.report_store.retention
+        return await self.report_repo.update(job)
+
+    async def retry(self, job: Report) -> Report:
+        """Put the job back to the queue."""
+        job.status = ReportStatus.PENDING
+        job.started_at = None
+        return await self.report_repo.update(job)
+
+    async def housekeep(self) -> tuple[int, int]:
+        """Requeue jobs of crashed workers and purge expired reports.
+
+        :return: Number of requeued and purged reports.
+        """
+        requeued = await self.report_repo.requeue_stale(
+            datetime.utcnow() - self.timeout
+        )
+        purged = await self.report_store.purge_expired()
+        return requeued, purged
@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.configuration import conf
+from src.db.models.report import Report, ReportStatus
+from src.repositories.report import ReportRepo
+from src.schemas.report import ReportFile
+
+
+class ReportStore:
+    """Service which keeps rendered reports on disk for a limited time."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        directory: Path = conf.reports.store_dir,
+        retention: timedelta = timedelta(hours=conf.reports.retention_hours),
+    ):
+        self.session = session
+        self.directory = directory
+        self.retention = retention
+        self.report_repo = ReportRepo(session)
+
+    async def save(
+        self,
+        report: ReportFile,
+        title: str,
+        report_type: str,
+        report_format: str,
+        generated_by: int,
+        parameters: dict[str, Any] | None = None,
+    ) -> Report:
+        """Write the report to the store and register it with an expiry."""
+        await self.purge_expired()
+
+        path = self.directory / f"{uuid4().hex}_{report.filename}"
+        await asyncio.to_thread(self._write, path, report.content)
+
+        now = datetime.utcnow()
+        return await self.report_repo.create(
+            Report(
+                title=title,
+                type=report_type,
+                format=report_format,
+                parameters=parameters,
+                status=ReportStatus.DONE,
+                file_path=str(path),
+                generated_by=generated_by,
+                generated_at=now,
+                expires_at=now + self.retention,
+            )
+        )
+
+    async def attach(self, job: Report, report: ReportFile) -> Report:
+        """Write the rendered file of a report job and mark the job as done."""
+        path = self.directory / f"{uuid4().hex}_{report.filename}"
+        await asyncio.to_thread(self._write, path, report.content)
+
+        now = datetime.utcnow()
+        job.status = ReportStatus.DONE
+        job.file_path = str(path)
+        job.generated_at = now
+        job.expires_at = now + self.retention
+        return await self.report_repo.update(job)
+
+    async def purge_expired(self) -> int:
+        """Delete expired reports and their files.
+
+        :return: Number of purged reports.
+        """
+        expired = await self.report_repo.get_expired(datetime.utcnow())
+        if not expired:
+            return 0
+
+        await asyncio.to_thread(
+            self._unlink, [report.file_path for report in expired if report.file_path]
+        )
+        await self.report_repo.delete_by_ids([report.id for report in expired])
+        return len(expired)
+
+    @staticmethod
+    def _write(path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    @staticmethod
+    def _unlink(paths: list[str]) -> None:
+        for path in paths:
+            Path(path).unlink(missing_ok=True)
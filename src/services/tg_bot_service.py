@@ -1,19 +1,66 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+from functools import cached_property
 
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.cache import Cache, ReportCache
 from src.services.balance import BalanceService
 from src.services.establishment import EstablishmentService
 from src.services.report import ReportService
+from src.services.report_queue import ReportQueue
 from src.services.transaction import TransactionService
 from src.services.user import UserService
 
 
 class TelegramBotService:
-    """Main service class that aggregates all other services."""
-
-    def __init__(self, session: AsyncSession):
-        self.session = session
-        self.user_service = UserService(session)
-        self.transaction_service = TransactionService(session)
-        self.balance_service = BalanceService(session)
-        self.establishment_service = EstablishmentService(session)
-        self.report_service = ReportService(session)
+    """Main service class that aggregates all other services.
+
+    The session and every service are created on first access, so updates
+    which never touch the database cost no session or service objects.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        cache: Cache | None = None,
+    ):
+        """Initialize service.
+
+        :param cache: Cache of reports and the company summary, reports are not
+        made stale nor the summary shared when omitted.
+        """
+        self.session_factory = session_factory
+        self.cache = cache
+        self.report_cache = ReportCache(cache) if cache is not None else None
+
+    @cached_property
+    def session(self) -> AsyncSession:
+        return self.session_factory()
+
+    @cached_property
+    def user_service(self) -> UserService:
+        return UserService(self.session, self.report_cache)
+
+    @cached_property
+    def transaction_service(self) -> TransactionService:
+        return TransactionService(self.session, self.report_cache)
+
+    @cached_property
+    def balance_service(self) -> BalanceService:
+        return BalanceService(self.session, self.report_cache)
+
+    @cached_property
+    def establishment_service(self) -> EstablishmentService:
+        return EstablishmentService(self.session)
+
+    @cached_property
+    def report_service(self) -> ReportService:
+        return ReportService(self.session, self.cache)
+
+    @cached_property
+    def report_queue(self) -> ReportQueue:
+        return ReportQueue(self.session)
+
+    async def close(self) -> None:
+        """Close the session if it was ever opened."""
+        if "session" in self.__dict__:
+            await self.session.close()
@@ -1,6 +1,7 @@
 from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import ReportCache
 from src.db.models.establishment import Establishment
 from src.db.models.transaction import Transaction, TransactionStatus, TransactionType
 from src.db.models.user import User
@@ -14,8 +15,13 @@ from src.schemas.balance import PaymentRequest, PaymentResult
 class TransactionService:
     """Service for transaction processing."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, report_cache: ReportCache | None = None):
+        """Initialize service.
+
+        :param report_cache: Cached reports made stale by completed transactions.
+        """
         self.session = session
+        self.report_cache = report_cache
         self.user_repo = UserRepo(session)
         self.establishment_repo = EstablishmentRepo(session)
         self.transaction_repo = TransactionRepo(session)
@@ -142,6 +148,10 @@ class TransactionService:
         transaction.updated_at = func.current_timestamp()
         await self.transaction_repo.update(transaction)
 
+        # The update committed, reports rendered from now on see the transaction
+        if self.report_cache is not None and transaction.establishment_id:
+            await self.report_cache.invalidate(transaction.establishment_id)
+
     async def process_refund(
         self, transaction_id: int, admin_id: int, reason: str | None = None
     ) -> PaymentResult:
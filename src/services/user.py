@@ -3,6 +3,7 @@ from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import ReportCache
 from src.db.models.transaction import Transaction, TransactionStatus
 from src.db.models.user import User, UserRole
 from src.errors.custom import ValidationError
@@ -13,8 +14,13 @@ from src.repositories.user import UserRepo
 class UserService:
     """Service for user-related operations."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, report_cache: ReportCache | None = None):
+        """Initialize service.
+
+        :param report_cache: Cached reports made stale by withdrawals.
+        """
         self.session = session
+        self.report_cache = report_cache
         self.user_repo = UserRepo(session)
         self.transaction_repo = TransactionRepo(session)
 
@@ -94,5 +100,7 @@ class UserService:
         )
         await self.transaction_repo.create(transaction)
         await self.user_repo.update(user)
+        if self.report_cache is not None:
+            await self.report_cache.invalidate(establishment_id)
 
         return transaction
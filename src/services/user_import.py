@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from typing import IO
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.configuration import conf
+from src.errors.custom import ValidationError
+from src.repositories.department import DepartmentRepo
+from src.repositories.user import UserRepo
+from src.schemas.user_import import ImportedUser, ImportResult, ImportRowError
+from src.utils.user_import import iter_import_chunks
+
+USER_COLUMNS = ("username", "first_name", "last_name", "phone", "email")
+
+
+class UserImportService:
+    """Service for bulk imports of employees and their departments."""
+
+    def __init__(
+        self, session: AsyncSession, chunk_size: int = conf.admin.import_chunk_size
+    ):
+        self.session = session
+        self.chunk_size = chunk_size
+        self.user_repo = UserRepo(session)
+        self.department_repo = DepartmentRepo(session)
+        self._department_ids: dict[str, int] = {}
+
+    async def import_file(self, file: IO[bytes], filename: str) -> ImportResult:
+        """Upsert employees of an XLSX or CSV file, a chunk per transaction.
+
+        Unknown departments are created. Rejected rows and chunks are reported
+        in the result, the rest of the file is still imported.
+
+        :param filename: Original name, its extension selects the format
+        :raises ValidationError: When the file can not be read at all
+        """
+        result = ImportResult()
+        chunks = iter_import_chunks(file, filename, self.chunk_size)
+        last_row = None
+        while True:
+            try:
+                chunk = await asyncio.to_thread(next, chunks, None)
+            except ValidationError as e:
+                if last_row is None:
+                    raise
+                # Earlier chunks are committed already, report how far it got
+                result.errors.append(
+                    ImportRowError(
+                        row=last_row + 1, message=f"Файл прочитан не до конца: {e}"
+                    )
+                )
+                break
+            if chunk is None:
+                break
+            if chunk:
+                last_row = chunk[-1].row
+            users = []
+            for row in chunk:
+                if isinstance(row, ImportRowError):
+                    result.errors.append(row)
+                else:
+                    users.append(row)
+            if users:
+                await self._import_chunk(users, result)
+        result.errors.sort(key=lambda error: error.row)
+        return result
+
+    async def _import_chunk(
+        self, users: list[ImportedUser], result: ImportResult
+    ) -> None:
+        try:
+            department_ids = await self._resolve_departments(users)
+            created, updated = await self.user_repo.upsert_many(
+                [
+                    {
+                        "telegram_id": user.telegram_id,
+                        **{name: getattr(user, name) for name in USER_COLUMNS},
+                        "department_id": department_ids.get(user.department),
+                    }
+                    for user in users
+                ]
+            )
+            await self.session.commit()
+        except SQLAlchemyError:
+            logging.exception(
+                "Import of rows %s-%s failed", users[0].row, users[-1].row
+            )
+            await self.session.rollback()
+            result.errors.extend(
+                ImportRowError(row=user.row, message="Ошибка базы данных")
+                for user in users
+            )
+            return
+
+        new_departments = department_ids.keys() - self._department_ids.keys()
+        result.departments_created += len(new_departments)
+        self._department_ids.update(department_ids)
+        result.created += created
+        result.updated += updated
+
+    async def _resolve_departments(self, users) -> dict[str, int]:
+        """Ids of departments named in the chunk, missing ones are inserted.
+
+        Departments inserted here are only remembered once the chunk commits.
+        """
+        names = {user.department for user in users if user.department}
+        department_ids = {
+            name: self._department_ids[name]
+            for name in names
+            if name in self._department_ids
+        }
+        unknown = names - department_ids.keys()
+        if unknown:
+            existing = await self.department_repo.get_ids_by_name(unknown)
+            self._department_ids.update(existing)
+            department_ids.update(existing)
+            unknown -= existing.keys()
+        if unknown:
+            department_ids.update(await self.department_repo.create_many(unknown))
+        return department_ids
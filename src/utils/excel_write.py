@@ -1,8 +1,11 @@
+import io
+
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Font, PatternFill
 
 
-def write_revenue_excel(data: dict, filename="revenue_summary.xlsx"):
+def write_revenue_excel(data: dict) -> bytes:
+    """Render the revenue summary workbook into memory."""
     wb = Workbook()
     ws = wb.active
     ws.title = "Revenue Summary"
@@ -36,8 +39,9 @@ def write_revenue_excel(data: dict, filename="revenue_summary.xlsx"):
     for col in ["A", "B"]:
         ws.column_dimensions[col].width = 25
 
-    wb.save(filename)
-    return True
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue()
 
 
 # data = {
@@ -49,4 +53,4 @@ def write_revenue_excel(data: dict, filename="revenue_summary.xlsx"):
 #     "average_order_value": 40.02,
 # }
 # # Пример использования
-# write_revenue_excel(data, filename=f"reports/revenue-summary_{datetime.now().strftime('%d-%m-%Y %H-%M-%S')}.xlsx") # revenue summary name with date
+# content = write_revenue_excel(data)
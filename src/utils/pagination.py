@@ -0,0 +1,28 @@
+"""Keyset pagination cursors.
+
+A cursor holds the sort key of the last row of a page, ``(created_at, id)``,
+so the next page is read with ``WHERE (created_at, id) < cursor`` from the
+index instead of skipping ``OFFSET`` rows.
+"""
+
+import base64
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Build an opaque cursor from the sort key of a row."""
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Restore the sort key from a cursor.
+
+    :raises ValueError: When the cursor is malformed
+    :return: created_at and id of the last seen row.
+    """
+    try:
+        created_at, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(id)
+    except (UnicodeDecodeError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -1,16 +1,22 @@
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+import io
 
+from reportlab.lib.pagesizes import A4, letter
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
 
-def write_revenue_pdf(data: dict, filename="revenue_summary.pdf"):
-    doc = SimpleDocTemplate(filename, pagesize=A4)
-    styles = getSampleStyleSheet()
+from src.utils.report_styles import get_styles
+
+
+def write_revenue_pdf(data: dict) -> bytes:
+    """Render the revenue summary PDF into memory."""
+    output = io.BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=A4)
+    styles = get_styles()
     elements = []
 
     # Заголовок
-    elements.append(Paragraph(f"Revenue Summary for {data['name']}", styles["Title"]))
+    elements.append(
+        Paragraph(f"Revenue Summary for {data['name']}", styles.paragraphs["title"])
+    )
     elements.append(Spacer(1, 20))
 
     # Таблица данных
@@ -24,32 +30,54 @@ def write_revenue_pdf(data: dict, filename="revenue_summary.pdf"):
     ]
 
     table = Table(table_data, colWidths=[150, 250])
-    table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 11),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-            ]
-        )
-    )
+    table.setStyle(styles.table)
 
     elements.append(table)
     doc.build(elements)
-    return True
-
-
-# # Пример использования
-# data = {
-#     "establishment_id": 1,
-#     "name": "Cafe Mocha",
-#     "total_revenue": 1200.50,
-#     "today_revenue": 150.75,
-#     "total_orders": 30,
-#     "average_order_value": 40.02,
-# }
-# write_revenue_pdf(data)
+    return output.getvalue()
+
+
+def write_statistics_pdf(dept_spending: list, est_spending: list) -> bytes:
+    """
+    Generates a PDF report from statistics data, writing it to an in-memory buffer.
+    """
+    output = io.BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=letter)
+    styles = get_styles()
+    title_style = styles.paragraphs["title"]
+    header_style = styles.paragraphs["heading"]
+    elements = []
+
+    # Main Title
+    elements.append(Paragraph("Статистический отчет", title_style))
+    elements.append(Spacer(1, 24))
+
+    # Department Spending Table
+    elements.append(Paragraph("Расходы по отделам", header_style))
+    elements.append(Spacer(1, 12))
+
+    # Manually construct table data with a header row
+    dept_table_data = [["Отдел", "Сумма расходов"]]
+    for name, spending in dept_spending:
+        dept_table_data.append([name, f"{spending:,.2f} UZS"])
+
+    dept_table = Table(dept_table_data, colWidths=[250, 150])
+    dept_table.setStyle(styles.table)
+    elements.append(dept_table)
+    elements.append(Spacer(1, 24))
+
+    # Establishment Spending Table
+    elements.append(Paragraph("Расходы по заведениям", header_style))
+    elements.append(Spacer(1, 12))
+
+    # Manually construct table data for the second table
+    est_table_data = [["Заведение", "Сумма расходов"]]
+    for name, spending in est_spending:
+        est_table_data.append([name, f"{spending:,.2f} UZS"])
+
+    est_table = Table(est_table_data, colWidths=[250, 150])
+    est_table.setStyle(styles.table)
+    elements.append(est_table)
+
+    doc.build(elements)
+    return output.getvalue()
@@ -0,0 +1,52 @@
+"""Helpers for building half-open date ranges.
+
+Comparing ``created_at`` against a ``[start, end)`` range keeps predicates
+sargable, so ``idx_transactions_created_at_id`` can be used instead of
+evaluating ``DATE(created_at)`` for every row.
+"""
+
+from datetime import datetime, timedelta
+
+
+def day_bounds(moment: datetime | None = None) -> tuple[datetime, datetime]:
+    """Get the start of the day and the start of the next one."""
+    moment = moment or datetime.now()
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start, start + timedelta(days=1)
+
+
+def month_bounds(moment: datetime | None = None) -> tuple[datetime, datetime]:
+    """Get the start of the month and the start of the next one."""
+    start, _ = day_bounds(moment)
+    start = start.replace(day=1)
+    return start, (start + timedelta(days=32)).replace(day=1)
+
+
+GRANULARITIES = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+""" Bucket sizes matching ``date_trunc`` fields, finest first """
+
+
+def truncate(moment: datetime, granularity: str) -> datetime:
+    """Get the start of the bucket like ``date_trunc`` does, weeks start on Monday."""
+    start = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "hour":
+        return start
+    start = start.replace(hour=0)
+    if granularity == "day":
+        return start
+    return start - timedelta(days=start.weekday())
+
+
+def bucket_starts(start: datetime, end: datetime, granularity: str) -> list[datetime]:
+    """Get starts of every bucket intersecting the ``[start, end)`` range."""
+    step = GRANULARITIES[granularity]
+    bucket = truncate(start, granularity)
+    buckets = []
+    while bucket < end:
+        buckets.append(bucket)
+        bucket += step
+    return buckets
@@ -0,0 +1,73 @@
+"""Process pool which renders reports away from the event loop.
+
+ReportLab and openpyxl are synchronous and CPU-bound, so rendering inside a
+handler would stall every other update. Render functions must be importable
+module-level functions taking and returning picklable values.
+"""
+
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
+
+from src.configuration import conf
+from src.errors.custom import RenderQueueFullError
+
+T = TypeVar("T")
+
+
+class ReportRenderer:
+    """Runs render functions in a process pool with a bounded queue."""
+
+    def __init__(self, workers: int, queue_size: int):
+        """Initialize renderer, processes are started on first use.
+
+        :param workers: Number of worker processes
+        :param queue_size: Maximum renders running or waiting at once.
+        """
+        self.workers = workers
+        self.queue_size = queue_size
+        self.pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Process pool, created lazily."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def render(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a render function in the pool.
+
+        :raises RenderQueueFullError: When too many reports are in progress
+        :return: Result of the render function.
+        """
+        if self.pending >= self.queue_size:
+            raise RenderQueueFullError(
+                f"{self.pending} reports are already being rendered"
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, partial(func, *args, **kwargs)
+            )
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Stop worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+report_renderer = ReportRenderer(
+    workers=conf.reports.render_workers, queue_size=conf.reports.render_queue_size
+)
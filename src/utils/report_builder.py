@@ -0,0 +1,160 @@
+"""Detailed establishment reports.
+
+Transactions of a period arrive as columns, are grouped with pandas and
+rendered as a multi-sheet workbook or a multi-table PDF. Everything here runs
+in the report worker pool.
+"""
+
+import io
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
+
+from src.utils.report_styles import get_styles
+
+SHEETS = {
+    "summary": "Umumiy",
+    "by_day": "Kunlar bo'yicha",
+    "by_hour": "Soatlar bo'yicha",
+    "by_employee": "Xodimlar bo'yicha",
+}
+
+
+def aggregate_transactions(columns: dict[str, list]) -> dict[str, pd.DataFrame]:
+    """Group transactions by day, hour and employee.
+
+    :param columns: Columns created_at, amount_cents, user_id and user_name
+    :return: Tables keyed like SHEETS.
+    """
+    frame = pd.DataFrame(
+        {
+            "created_at": pd.to_datetime(columns["created_at"]),
+            "amount": np.asarray(columns["amount_cents"], dtype=np.int64),
+            "user_id": np.asarray(columns["user_id"], dtype=np.int64),
+            "user_name": columns["user_name"],
+        }
+    )
+
+    by_day = (
+        frame.groupby(frame["created_at"].dt.date)["amount"]
+        .agg(["count", "sum"])
+        .rename_axis("Sana")
+        .reset_index()
+    )
+    by_hour = (
+        frame.groupby(frame["created_at"].dt.hour)["amount"]
+        .agg(["count", "sum"])
+        .reindex(range(24), fill_value=0)
+        .rename_axis("Soat")
+        .reset_index()
+    )
+    by_hour["Soat"] = by_hour["Soat"].map("{:02d}:00".format)
+    by_employee = (
+        frame.groupby(["user_id", "user_name"])["amount"]
+        .agg(["count", "sum"])
+        .sort_values("sum", ascending=False)
+        .reset_index()
+        .rename(columns={"user_id": "ID", "user_name": "Xodim"})
+    )
+
+    total = int(frame["amount"].sum())
+    orders = len(frame)
+    summary = pd.DataFrame(
+        {
+            "Ko'rsatkich": [
+                "Umumiy daromad",
+                "Buyurtmalar soni",
+                "O'rtacha buyurtma",
+                "Xodimlar soni",
+            ],
+            "Qiymat": [
+                _money(total),
+                orders,
+                _money(total / orders if orders else 0),
+                int(frame["user_id"].nunique()),
+            ],
+        }
+    )
+
+    tables = {"summary": summary}
+    for name, table in (
+        ("by_day", by_day),
+        ("by_hour", by_hour),
+        ("by_employee", by_employee),
+    ):
+        average = table["sum"] / table["count"].clip(lower=1)
+        tables[name] = table.assign(
+            sum=table["sum"] / 100, average=(average / 100).round(2)
+        ).rename(
+            columns={
+                "count": "Buyurtmalar",
+                "sum": "Daromad",
+                "average": "O'rtacha",
+            }
+        )
+    return tables
+
+
+def write_detailed_excel(tables: dict[str, pd.DataFrame], title: str) -> bytes:
+    """Render tables as sheets of one workbook."""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        for name, table in tables.items():
+            table.to_excel(writer, sheet_name=SHEETS[name], index=False, startrow=2)
+            sheet = writer.sheets[SHEETS[name]]
+            sheet.write(0, 0, title)
+            sheet.set_column(0, len(table.columns) - 1, 20)
+    return output.getvalue()
+
+
+def write_detailed_pdf(tables: dict[str, pd.DataFrame], title: str) -> bytes:
+    """Render tables one after another in a PDF document."""
+    styles = get_styles()
+    output = io.BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=A4)
+
+    elements = [Paragraph(title, styles.paragraphs["title"]), Spacer(1, 16)]
+    for name, table in tables.items():
+        elements.append(Paragraph(SHEETS[name], styles.paragraphs["heading"]))
+        elements.append(Spacer(1, 8))
+        data = [list(table.columns)] + table.astype(str).values.tolist()
+        pdf_table = Table(data, repeatRows=1)
+        pdf_table.setStyle(styles.compact_table)
+        elements.append(pdf_table)
+        elements.append(Spacer(1, 16))
+
+    doc.build(elements)
+    return output.getvalue()
+
+
+def build_detailed_report(
+    columns: dict[str, list],
+    establishment_name: str,
+    start_date: datetime,
+    end_date: datetime,
+    report_format: str,
+) -> bytes:
+    """Aggregate transactions of the period and render them.
+
+    :param start_date: First day of the period
+    :param end_date: Day after the last one of the period
+    :param report_format: Either "pdf" or "xlsx"
+    :return: Rendered file.
+    """
+    tables = aggregate_transactions(columns)
+    last_day = end_date - timedelta(days=1)
+    title = (
+        f"{establishment_name}: {start_date:%d.%m.%Y} - "
+        f"{last_day:%d.%m.%Y} hisobot"
+    )
+    if report_format == "pdf":
+        return write_detailed_pdf(tables, title)
+    return write_detailed_excel(tables, title)
+
+
+def _money(cents: float) -> str:
+    return f"{cents / 100:,.2f}"
+
@@ -0,0 +1,96 @@
+"""Fonts and styles shared by every PDF report.
+
+Fonts are registered once per process, on first use, from
+``conf.reports.font_dir``. Styles are built once on top of them and must not
+be modified by writers, clone them instead.
+"""
+
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import TableStyle
+
+from src.configuration import conf
+
+FONT_FILES = {
+    "DejaVuSans": "DejaVuSans.ttf",
+    "DejaVuSans-Bold": "DejaVuSans-Bold.ttf",
+}
+
+
+@dataclass(frozen=True)
+class ReportFonts:
+    """Names of registered fonts."""
+
+    regular: str
+    bold: str
+
+
+@dataclass(frozen=True)
+class ReportStyles:
+    """Prebuilt paragraph and table styles."""
+
+    paragraphs: MappingProxyType[str, ParagraphStyle]
+    table: TableStyle
+    """ Bordered table with a bold header row """
+    compact_table: TableStyle
+    """ Same as table with a smaller font for wide reports """
+
+
+@lru_cache(maxsize=1)
+def get_fonts() -> ReportFonts:
+    """Register DejaVu fonts which can render Cyrillic text.
+
+    Falls back to Helvetica, which can not, when the fonts are missing.
+    """
+    try:
+        for name, filename in FONT_FILES.items():
+            if name not in pdfmetrics.getRegisteredFontNames():
+                pdfmetrics.registerFont(TTFont(name, conf.reports.font_dir / filename))
+    except Exception as e:
+        logging.warning(
+            "Could not register DejaVuSans fonts from %s, PDF reports will not "
+            "render Cyrillic: %s",
+            conf.reports.font_dir,
+            e,
+        )
+        return ReportFonts(regular="Helvetica", bold="Helvetica-Bold")
+    return ReportFonts(regular="DejaVuSans", bold="DejaVuSans-Bold")
+
+
+@lru_cache(maxsize=1)
+def get_styles() -> ReportStyles:
+    """Build report styles on first use."""
+    fonts = get_fonts()
+    sample = getSampleStyleSheet()
+    paragraphs = {
+        "title": sample["Title"].clone("ReportTitle", fontName=fonts.bold),
+        "heading": sample["h2"].clone("ReportHeading", fontName=fonts.bold),
+        "body": sample["Normal"].clone("ReportBody", fontName=fonts.regular),
+    }
+    return ReportStyles(
+        paragraphs=MappingProxyType(paragraphs),
+        table=_table_style(fonts, font_size=11, header_padding=12),
+        compact_table=_table_style(fonts, font_size=9, header_padding=6),
+    )
+
+
+def _table_style(fonts: ReportFonts, font_size: int, header_padding: int):
+    return TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+            ("FONTNAME", (0, 0), (-1, 0), fonts.bold),
+            ("FONTNAME", (0, 1), (-1, -1), fonts.regular),
+            ("FONTSIZE", (0, 0), (-1, -1), font_size),
+            ("BOTTOMPADDING", (0, 0), (-1, 0), header_padding),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ]
+    )
@@ -0,0 +1,163 @@
+"""Reading of employee import files.
+
+Workbooks are opened by openpyxl in read-only mode and CSV files are decoded
+while they are read, so only the current chunk of rows is kept in memory.
+Reading is synchronous and is meant to run in a worker thread.
+"""
+
+import csv
+import io
+from collections.abc import Iterator
+from itertools import islice
+from typing import IO, Any
+from zipfile import BadZipFile
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+from src.errors.custom import ValidationError
+from src.schemas.user_import import ImportedUser, ImportRowError
+
+HEADER_ALIASES = {
+    "telegram_id": "telegram_id",
+    "telegram id": "telegram_id",
+    "username": "username",
+    "first_name": "first_name",
+    "имя": "first_name",
+    "last_name": "last_name",
+    "фамилия": "last_name",
+    "phone": "phone",
+    "телефон": "phone",
+    "email": "email",
+    "department": "department",
+    "отдел": "department",
+}
+MAX_LENGTHS = {
+    "username": 255,
+    "first_name": 255,
+    "last_name": 255,
+    "phone": 20,
+    "email": 255,
+    "department": 255,
+}
+BIGINT_MAX = 2**63 - 1
+
+
+def read_rows(file: IO[bytes], filename: str) -> Iterator[tuple[Any, ...]]:
+    """Read raw rows of an XLSX or CSV file, header included.
+
+    :param filename: Original name, its extension selects the format
+    :raises ValidationError: When the file is not a readable XLSX or UTF-8 CSV,
+    possibly after some rows were read
+    """
+    try:
+        yield from _read_rows(file, filename)
+    except UnicodeDecodeError:
+        raise ValidationError("CSV файл должен быть в кодировке UTF-8") from None
+    except csv.Error as e:
+        raise ValidationError(f"Неверный формат CSV: {e}") from None
+    except (BadZipFile, InvalidFileException):
+        raise ValidationError("Файл XLSX повреждён или имеет другой формат") from None
+
+
+def _read_rows(file: IO[bytes], filename: str) -> Iterator[tuple[Any, ...]]:
+    if filename.lower().endswith(".csv"):
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        yield from (tuple(row) for row in csv.reader(text))
+        return
+
+    if not filename.lower().endswith(".xlsx"):
+        raise ValidationError("Поддерживаются только файлы XLSX и CSV")
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def parse_header(header: tuple[Any, ...]) -> list[str | None]:
+    """Map header cells to ImportedUser fields, unknown columns map to None."""
+    fields = [
+        HEADER_ALIASES.get(str(cell).strip().lower()) if cell is not None else None
+        for cell in header
+    ]
+    if "telegram_id" not in fields:
+        raise ValidationError("В файле нет колонки telegram_id")
+    return fields
+
+
+def parse_row(row_number: int, fields: list[str | None], row: tuple) -> ImportedUser:
+    """Validate a row.
+
+    :raises ValidationError: With a message for the admin
+    """
+    values = {}
+    for name, cell in zip(fields, row):
+        if name is None or cell is None:
+            continue
+        value = str(cell).strip()
+        if value:
+            values[name] = cell if name == "telegram_id" else value
+
+    telegram_id = values.pop("telegram_id", None)
+    if telegram_id is None:
+        raise ValidationError("Не указан telegram_id")
+    values["telegram_id"] = _parse_telegram_id(telegram_id)
+
+    for name, limit in MAX_LENGTHS.items():
+        if len(values.get(name, "")) > limit:
+            raise ValidationError(f"{name} длиннее {limit} символов")
+    return ImportedUser(row=row_number, **values)
+
+
+def iter_import_chunks(
+    file: IO[bytes], filename: str, chunk_size: int
+) -> Iterator[list[ImportedUser | ImportRowError]]:
+    """Read the file in chunks of parsed rows.
+
+    Rows are numbered like in the spreadsheet, the header is row 1. When a
+    telegram_id repeats within a chunk the later row wins, the earlier one is
+    reported.
+
+    :raises ValidationError: When the file can not be read, before the first
+    chunk or between chunks
+    """
+    rows = read_rows(file, filename)
+    header = next(rows, None)
+    if header is None:
+        raise ValidationError("Файл пустой")
+    fields = parse_header(header)
+
+    numbered = enumerate(rows, start=2)
+    while chunk := list(islice(numbered, chunk_size)):
+        parsed = []
+        positions: dict[int, int] = {}
+        for row_number, row in chunk:
+            if not any(cell not in (None, "") for cell in row):
+                continue
+            try:
+                user = parse_row(row_number, fields, row)
+            except ValidationError as e:
+                parsed.append(ImportRowError(row=row_number, message=str(e)))
+                continue
+            if user.telegram_id in positions:
+                position = positions[user.telegram_id]
+                parsed[position] = ImportRowError(
+                    row=parsed[position].row,
+                    message=f"telegram_id повторяется в строке {row_number}",
+                )
+            positions[user.telegram_id] = len(parsed)
+            parsed.append(user)
+        yield parsed
+
+
+def _parse_telegram_id(value: Any) -> int:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    try:
+        telegram_id = int(str(value).strip())
+    except ValueError:
+        raise ValidationError(f"Неверный telegram_id: {value}") from None
+    if not 0 < telegram_id <= BIGINT_MAX:
+        raise ValidationError(f"Неверный telegram_id: {value}")
+    return telegram_id
@@ -0,0 +1,29 @@
+"""Tests for the dashboard snapshot cache."""
+
+import asyncio
+
+import pytest
+
+from src.cache import Cache, DashboardCache
+
+pytest.importorskip("lupa")
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.mark.asyncio
+async def test_missing_snapshot_is_computed_once():
+    """Concurrent requests of admin processes share one computation."""
+    redis = fakeredis.FakeAsyncRedis()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"users": 1}
+
+    caches = [DashboardCache(Cache(redis), wait=1) for _ in range(3)]
+    snapshots = await asyncio.gather(*(cache.get(compute) for cache in caches))
+
+    assert calls == 1
+    assert [snapshot.data for snapshot in snapshots] == [{"users": 1}] * 3
@@ -0,0 +1,48 @@
+"""Tests for the in-process TTL cache."""
+
+import asyncio
+
+import pytest
+
+from src.cache import TTLCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    """Callers missing the same key wait for a single loader call."""
+    cache = TTLCache(ttl=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load("key", load) for _ in range(5)))
+
+    assert results == ["value"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_loader_does_not_cancel_waiters():
+    """A waiter loads the value itself when the loading caller is cancelled."""
+    cache = TTLCache(ttl=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    owner = asyncio.create_task(cache.get_or_load("key", load))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load("key", load))
+    await asyncio.sleep(0)
+    owner.cancel()
+
+    assert await waiter == 2
+    with pytest.raises(asyncio.CancelledError):
+        await owner
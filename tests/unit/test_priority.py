@@ -0,0 +1,70 @@
+"""Tests for priority lanes."""
+
+import asyncio
+
+import pytest
+from aiogram import Dispatcher, F, Router
+from aiogram.types import Message
+
+from src.bot.middlewares.priority_md import (
+    PAYMENT_LANE,
+    REPORT_LANE,
+    Lane,
+    LaneMetrics,
+    PriorityMiddleware,
+)
+from tests.utils.mocked_bot import MockedBot
+from tests.utils.updates import get_message, get_update
+
+
+@pytest.mark.asyncio
+async def test_full_report_lane_sheds_without_blocking_payments(monkeypatch):
+    """Reports beyond their lane are shed while payments keep running."""
+    answers = []
+
+    async def answer(self, text, **kwargs):
+        answers.append(text)
+
+    monkeypatch.setattr(Message, "answer", answer)
+    release = asyncio.Event()
+    handled = []
+    router = Router()
+
+    @router.message(F.text == "report", flags={"lane": REPORT_LANE})
+    async def report(message: Message):
+        await release.wait()
+        handled.append("report")
+
+    @router.message(F.text == "pay", flags={"lane": PAYMENT_LANE})
+    async def pay(message: Message):
+        handled.append("pay")
+
+    metrics = LaneMetrics()
+    priority = PriorityMiddleware(
+        lanes={
+            PAYMENT_LANE: Lane(concurrency=1),
+            REPORT_LANE: Lane(concurrency=1, max_waiting=0),
+        },
+        default_lane=REPORT_LANE,
+        metrics=metrics,
+    )
+    dp = Dispatcher()
+    dp.include_router(router)
+    dp.message.middleware(priority)
+    bot = MockedBot()
+
+    def feed(text: str):
+        return dp.feed_update(bot, get_update(message=get_message(text)))
+
+    running = asyncio.create_task(feed("report"))
+    await asyncio.sleep(0)
+    await feed("report")
+    await feed("pay")
+    release.set()
+    await running
+
+    assert handled == ["pay", "report"]
+    assert len(answers) == 1
+    stats = metrics.report()
+    assert stats[REPORT_LANE]["shed"] == 1
+    assert stats[PAYMENT_LANE]["handled"] == 1
@@ -0,0 +1,30 @@
+"""Tests for the shared company summary cache."""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from src.cache import Cache, SummaryCache
+
+pytest.importorskip("lupa")
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.mark.asyncio
+async def test_processes_share_one_computation():
+    """Caches of different processes compute a missing summary once."""
+    redis = fakeredis.FakeAsyncRedis()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"total_spending": Decimal("12.50"), "active_users": 3}
+
+    caches = [SummaryCache(Cache(redis), wait=1) for _ in range(3)]
+    summaries = await asyncio.gather(*(cache.get(compute) for cache in caches))
+
+    assert calls == 1
+    assert summaries == [{"total_spending": Decimal("12.50"), "active_users": 3}] * 3
@@ -0,0 +1,94 @@
+"""Tests for update sharding."""
+
+import asyncio
+import random
+
+import pytest
+from aiogram import Dispatcher, Router
+from aiogram.types import Message
+
+from src.bot.supervisor import OrderedFeeder, Supervisor, shard_key
+from src.configuration import conf
+from tests.utils.mocked_bot import MockedBot
+from tests.utils.updates import (
+    TEST_CHAT,
+    get_callback_query,
+    get_chat,
+    get_message,
+    get_update,
+)
+
+
+def raw_update(**kwargs) -> dict:
+    """Update as Telegram sends it."""
+    return get_update(**kwargs).model_dump(mode="json", exclude_unset=True)
+
+
+def test_shard_key_is_chat_id():
+    """Messages and callback queries shard by the chat they belong to."""
+    assert shard_key(raw_update(message=get_message("hi"))) == TEST_CHAT.id
+    assert shard_key(raw_update(callback_query=get_callback_query("x"))) == (
+        TEST_CHAT.id
+    )
+
+
+@pytest.mark.asyncio
+async def test_feeder_keeps_order_within_chat():
+    """Updates of a chat are handled in order while chats run concurrently."""
+    received: dict[int, list[int]] = {}
+    router = Router()
+
+    @router.message()
+    async def handler(message: Message):
+        await asyncio.sleep(random.random() / 100)
+        received.setdefault(message.chat.id, []).append(int(message.text))
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    feeder = OrderedFeeder(dp, MockedBot(), concurrency=5)
+    for number in range(30):
+        chat = get_chat(chat_id=number % 3)
+        await feeder.feed(raw_update(message=get_message(str(number), chat=chat)))
+    await feeder.drain()
+
+    assert received == {chat_id: list(range(chat_id, 30, 3)) for chat_id in range(3)}
+
+
+def test_webhook_ingress_requires_secret(monkeypatch):
+    """The supervisor does not accept webhook updates without a secret token."""
+    monkeypatch.setattr(conf.bot, "webhook_secret", None)
+    with pytest.raises(RuntimeError, match="BOT_WEBHOOK_SECRET"):
+        Supervisor(workers=1)._webhook_app()
+
+
+@pytest.mark.asyncio
+async def test_burst_of_one_chat_does_not_stall_others():
+    """Updates waiting for their chat take no slot, other chats still run."""
+    release = asyncio.Event()
+    received = []
+    router = Router()
+
+    @router.message()
+    async def handler(message: Message):
+        if message.chat.id == 0:
+            await release.wait()
+        received.append(message.chat.id)
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    feeder = OrderedFeeder(dp, MockedBot(), concurrency=2, chat_pending_limit=5)
+    for number in range(10):
+        await feeder.feed(
+            raw_update(message=get_message(str(number), chat=get_chat(0)))
+        )
+    await asyncio.wait_for(
+        feeder.feed(raw_update(message=get_message("other", chat=get_chat(1)))),
+        timeout=1,
+    )
+    await asyncio.sleep(0.05)
+    assert received == [1]
+
+    release.set()
+    await feeder.drain()
+    # Updates of the busy chat beyond its pending limit were dropped
+    assert received == [1] + [0] * 5
@@ -0,0 +1,156 @@
+"""Tests for update throttling."""
+
+import asyncio
+
+import pytest
+from aiogram import Dispatcher, F, Router
+from aiogram.types import Message
+from redis.exceptions import ConnectionError
+
+from src.bot.middlewares.throttling_md import (
+    CONSUME_TOKENS,
+    MemoryTokenBuckets,
+    ThrottleLimit,
+    ThrottlingMiddleware,
+)
+from tests.utils.mocked_bot import MockedBot
+from tests.utils.updates import get_message, get_update
+
+
+class FailingScript:
+    """Registered script of a Redis server which is down."""
+
+    def __init__(self, client):
+        self.registered_client = client
+        self.calls = 0
+
+    async def __call__(self, keys, args):
+        self.calls += 1
+        raise ConnectionError("Redis is down")
+
+
+class FailingRedis:
+    """Redis client whose scripts always fail."""
+
+    def register_script(self, script: str) -> FailingScript:
+        self.script = FailingScript(self)
+        return self.script
+
+
+class FailingCache:
+    """Cache adapter over FailingRedis."""
+
+    def __init__(self):
+        self.redis_client = FailingRedis()
+
+
+def get_throttled_dispatcher(
+    throttling: ThrottlingMiddleware, handled: list[str]
+) -> Dispatcher:
+    """Dispatcher with a throttled handler and a plain one."""
+    router = Router(name="establishment")
+
+    @router.message(F.text == "report", flags={"throttle": ThrottleLimit(0.001, 1)})
+    async def report(message: Message):
+        handled.append("report")
+
+    @router.message()
+    async def other(message: Message):
+        handled.append(message.text)
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    dp.message.middleware(throttling)
+    return dp
+
+
+@pytest.fixture
+def answers(monkeypatch) -> list[str]:
+    """Texts answered to throttled messages."""
+    sent = []
+
+    async def answer(self, text, **kwargs):
+        sent.append(text)
+
+    monkeypatch.setattr(Message, "answer", answer)
+    return sent
+
+
+def test_memory_buckets_refill():
+    """An empty bucket accepts again once enough time passed."""
+    buckets = MemoryTokenBuckets()
+    bucket = [("user", ThrottleLimit(rate=100, burst=1))]
+
+    assert buckets.consume(bucket)
+    assert not buckets.consume(bucket)
+    asyncio.run(asyncio.sleep(0.02))
+    assert buckets.consume(bucket)
+
+
+def test_memory_buckets_consume_all_or_nothing():
+    """A rejected update takes no token from its other buckets."""
+    buckets = MemoryTokenBuckets()
+    user = ("user", ThrottleLimit(rate=0.001, burst=2))
+    handler = ("handler", ThrottleLimit(rate=0.001, burst=1))
+
+    assert buckets.consume([user, handler])
+    assert not buckets.consume([user, handler])
+    assert buckets.consume([user])
+    assert not buckets.consume([user])
+
+
+@pytest.mark.asyncio
+async def test_router_and_handler_limits(answers):
+    """Handler and router buckets reject on top of the user one."""
+    handled = []
+    throttling = ThrottlingMiddleware(
+        user_limit=ThrottleLimit(rate=0.001, burst=100),
+        router_limits={"establishment": ThrottleLimit(rate=0.001, burst=3)},
+    )
+    dp = get_throttled_dispatcher(throttling, handled)
+    bot = MockedBot()
+
+    for text in ("report", "report", "a", "b", "c"):
+        await dp.feed_update(bot, get_update(message=get_message(text)))
+
+    assert handled == ["report", "a", "b"]
+    # Repeated rejections of the same bucket are answered once
+    assert len(answers) == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_memory(answers):
+    """Buckets are kept in the process for a while when Redis fails."""
+    handled = []
+    throttling = ThrottlingMiddleware(
+        user_limit=ThrottleLimit(rate=0.001, burst=2), fallback_for=60
+    )
+    dp = get_throttled_dispatcher(throttling, handled)
+    bot = MockedBot()
+    cache = FailingCache()
+
+    for text in ("a", "b", "c"):
+        await dp.feed_update(bot, get_update(message=get_message(text)), cache=cache)
+
+    assert handled == ["a", "b"]
+    assert cache.redis_client.script.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_consume_tokens_script():
+    """The Lua script refills, consumes all buckets or none and expires them."""
+    pytest.importorskip("lupa")
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeAsyncRedis()
+    script = redis.register_script(CONSUME_TOKENS)
+    keys = ["user", "handler"]
+
+    assert await script(keys=keys, args=[0.001, 2, 0.001, 1]) == 1
+    assert await script(keys=keys, args=[0.001, 2, 0.001, 1]) == 0
+    assert float(await redis.hget("user", "tokens")) == pytest.approx(1, abs=0.01)
+    assert 0 < await redis.pttl("user") <= 2_000_000
+    assert await script(keys=["user"], args=[0.001, 2]) == 1
+
+    assert await script(keys=["fast"], args=[1000, 1]) == 1
+    await asyncio.sleep(0.01)
+    assert await script(keys=["fast"], args=[1000, 1]) == 1
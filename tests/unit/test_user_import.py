@@ -0,0 +1,97 @@
+"""Tests for reading employee import files."""
+
+import io
+
+import pytest
+from openpyxl import Workbook
+
+from src.errors.custom import ValidationError
+from src.schemas.user_import import ImportedUser, ImportRowError
+from src.utils.user_import import iter_import_chunks, parse_row
+
+FIELDS = ["telegram_id", "first_name", "department"]
+
+
+def csv_file(text: str, encoding: str = "utf-8") -> io.BytesIO:
+    """CSV upload with the given content."""
+    return io.BytesIO(text.encode(encoding))
+
+
+def read_all(file: io.BytesIO, filename: str = "users.csv", chunk_size: int = 100):
+    """Chunks of an import file as a list."""
+    return list(iter_import_chunks(file, filename, chunk_size))
+
+
+def test_parse_row_accepts_whole_floats():
+    """Numeric XLSX cells arrive as floats and are accepted when whole."""
+    user = parse_row(2, FIELDS, (123456789.0, " Ali ", None))
+
+    assert user == ImportedUser(row=2, telegram_id=123456789, first_name="Ali")
+
+
+@pytest.mark.parametrize("telegram_id", ["abc", 1.5, 0, -5, 2**63, None, "  "])
+def test_parse_row_rejects_bad_telegram_ids(telegram_id):
+    """Ids which are missing, fractional or out of BIGINT range are rejected."""
+    with pytest.raises(ValidationError):
+        parse_row(2, FIELDS, (telegram_id, "Ali", None))
+
+
+def test_chunks_skip_blank_rows_and_report_bad_ones():
+    """Blank rows are skipped, invalid ones become errors with their row."""
+    file = csv_file("telegram_id,first_name\n1,Ali\n,\n\nx,Vali\n2,Sami\n")
+
+    assert read_all(file) == [
+        [
+            ImportedUser(row=2, telegram_id=1, first_name="Ali"),
+            ImportRowError(row=5, message="Неверный telegram_id: x"),
+            ImportedUser(row=6, telegram_id=2, first_name="Sami"),
+        ]
+    ]
+
+
+def test_chunks_keep_the_last_duplicate():
+    """A repeated telegram_id in a chunk keeps the later row."""
+    file = csv_file("telegram_id,first_name\n1,Ali\n2,Vali\n1,Sami\n")
+
+    [chunk] = read_all(file)
+
+    assert chunk == [
+        ImportRowError(row=2, message="telegram_id повторяется в строке 4"),
+        ImportedUser(row=3, telegram_id=2, first_name="Vali"),
+        ImportedUser(row=4, telegram_id=1, first_name="Sami"),
+    ]
+
+
+def test_chunks_are_split_by_size():
+    """Rows are yielded in chunks of the requested size."""
+    file = csv_file("telegram_id\n1\n2\n3\n")
+
+    assert [len(chunk) for chunk in read_all(file, chunk_size=2)] == [2, 1]
+
+
+def test_non_utf8_csv_is_a_validation_error():
+    """A cp1251 CSV, as Excel saves it, is rejected with a message."""
+    file = csv_file("telegram_id,имя\n1,Алишер\n", encoding="cp1251")
+
+    with pytest.raises(ValidationError, match="UTF-8"):
+        read_all(file)
+
+
+def test_corrupt_xlsx_is_a_validation_error():
+    """A file which is not a workbook is rejected with a message."""
+    with pytest.raises(ValidationError, match="XLSX"):
+        read_all(io.BytesIO(b"not a workbook"), filename="users.xlsx")
+
+
+def test_xlsx_rows_are_read():
+    """Workbook rows are read from the first sheet."""
+    workbook = Workbook()
+    workbook.active.append(["Telegram ID", "Отдел"])
+    workbook.active.append([42, "IT"])
+    file = io.BytesIO()
+    workbook.save(file)
+    file.seek(0)
+
+    assert read_all(file, filename="users.xlsx") == [
+        [ImportedUser(row=2, telegram_id=42, department="IT")]
+    ]
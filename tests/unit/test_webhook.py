@@ -0,0 +1,117 @@
+"""Tests for the webhook ingress."""
+
+import asyncio
+
+import pytest
+from aiogram import Dispatcher, Router
+from aiogram.types import Message
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.bot.webhook import build_webhook_app
+from tests.utils.mocked_bot import MockedBot
+from tests.utils.updates import get_message, get_update
+
+SECRET = "test-secret"
+
+
+def get_dispatcher_with(handler) -> Dispatcher:
+    """Dispatcher with a single message handler."""
+    router = Router()
+    router.message()(handler)
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp
+
+
+def post_update(client: TestClient, text: str, secret: str = SECRET):
+    """Post a fake message update to the webhook."""
+    return client.post(
+        "/webhook",
+        data=get_update(message=get_message(text)).model_dump_json(exclude_none=True),
+        headers={
+            "Content-Type": "application/json",
+            "X-Telegram-Bot-Api-Secret-Token": secret,
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_webhook_rejects_wrong_secret():
+    """Updates without the secret token are not handled."""
+    received = []
+
+    async def handler(message: Message):
+        received.append(message.text)
+
+    app = build_webhook_app(
+        get_dispatcher_with(handler), MockedBot(), path="/webhook", secret_token=SECRET
+    )
+    async with TestClient(TestServer(app)) as client:
+        response = await post_update(client, "hello", secret="wrong")
+        assert response.status == 401
+
+    assert received == []
+
+
+def test_webhook_requires_secret():
+    """Webhook mode refuses to start without a secret token."""
+
+    async def handler(message: Message):
+        pass
+
+    for secret in (None, ""):
+        with pytest.raises(RuntimeError, match="BOT_WEBHOOK_SECRET"):
+            build_webhook_app(
+                get_dispatcher_with(handler),
+                MockedBot(),
+                path="/webhook",
+                secret_token=secret,
+            )
+
+
+@pytest.mark.asyncio
+async def test_webhook_feeds_updates_to_dispatcher():
+    """Updates are answered at once and handled in the background."""
+    handled = asyncio.Event()
+    received = []
+
+    async def handler(message: Message):
+        received.append(message.text)
+        handled.set()
+
+    app = build_webhook_app(
+        get_dispatcher_with(handler), MockedBot(), path="/webhook", secret_token=SECRET
+    )
+    async with TestClient(TestServer(app)) as client:
+        response = await post_update(client, "hello")
+        assert response.status == 200
+        await asyncio.wait_for(handled.wait(), timeout=1)
+
+    assert received == ["hello"]
+
+
+@pytest.mark.asyncio
+async def test_webhook_limits_concurrency():
+    """Requests beyond the concurrency wait until an update is handled."""
+    release = asyncio.Event()
+
+    async def handler(message: Message):
+        await release.wait()
+
+    app = build_webhook_app(
+        get_dispatcher_with(handler),
+        MockedBot(),
+        path="/webhook",
+        secret_token=SECRET,
+        concurrency=2,
+    )
+    async with TestClient(TestServer(app)) as client:
+        for text in ("first", "second"):
+            assert (await post_update(client, text)).status == 200
+
+        waiting = asyncio.ensure_future(post_update(client, "third"))
+        await asyncio.sleep(0.1)
+        assert not waiting.done()
+
+        release.set()
+        assert (await asyncio.wait_for(waiting, timeout=1)).status == 200